@@ -1,9 +1,15 @@
+import asyncio
 import json
 import time
 import re
-from typing import List, Dict, Optional
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from functools import lru_cache, partial
+from typing import Iterator, List, Dict, Optional
 import logging
 import boto3
+import orjson
 from botocore.exceptions import ClientError, ReadTimeoutError, ConnectTimeoutError
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from app.config import settings
@@ -24,31 +30,417 @@ from app.models import (
     MaintenanceChatResponse,
     MaintenanceRequestExtraction
 )
-from app.exceptions import AITimeoutError, AIModelError
-
-# Import prompt builders
-from app.prompts.lease_analysis_prompts import (
-    build_lease_analysis_prompt,
-    build_categorized_analysis_prompt,
-    CATEGORIZED_ANALYSIS_SYSTEM_PROMPT
-)
-from app.prompts.maintenance_prompts import (
-    build_maintenance_evaluation_prompt,
-    build_vendor_work_order_prompt,
-    build_maintenance_workflow_prompt
-)
-from app.prompts.tenant_communication_prompts import (
-    build_tenant_message_rewrite_prompt,
-    build_move_out_evaluation_prompt
-)
-from app.prompts.chat_prompts import (
-    MAINTENANCE_CHAT_SYSTEM_PROMPT,
-    build_maintenance_extraction_prompt,
-    build_conversation_summary_prompt
+from app.exceptions import AITimeoutError, AIModelError, AIAccessDeniedError, AIThrottlingError
+from app.bedrock_utils import (
+    BAD_CTRL,
+    STREAM_DELTA_EXTRACTORS,
+    fix_truncated_json,
+    provider_for,
+    read_response_stream,
+    scan_json_block,
 )
 
 logger = logging.getLogger(__name__)
 
+_BANNER = "=" * 80
+
+# Trailing markdown fence left on an unterminated JSON block
+_TRAILING_FENCE = re.compile(r'```\s*$')
+
+# Category value -> enum member for parsing categorized violations without enum lookups
+_VIOLATION_CATEGORIES = {category.value: category for category in ViolationCategory}
+
+# Categories a valid categorized analysis response must contain
+_REQUIRED_CATEGORIES = frozenset(("rent_increase", "tenant_owner_rights", "fair_housing_laws", "licensing", "others"))
+
+# Values models use for a missing string field (JSON null, or null spelled out as text)
+_NULL_SENTINELS = frozenset((None, "", "null", "None"))
+
+# Repairing chat JSON: raw tab/LF/CR are escaped inside string literals only (between
+# tokens they are valid whitespace, e.g. in a pretty-printed reply)
+_JSON_STRING_LITERAL = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRING_CTRL_ESCAPES = {9: "\\t", 10: "\\n", 13: "\\r"}
+
+# bedrock-runtime client timeouts; botocore's adaptive retries are the only retry layer, so a
+# call that never answers gives up after MAX_ATTEMPTS * (CONNECT + READ) seconds plus <= 1s backoff
+_BEDROCK_CONNECT_TIMEOUT_SECONDS = 5
+_BEDROCK_READ_TIMEOUT_SECONDS = 80
+_BEDROCK_MAX_ATTEMPTS = 2
+_BEDROCK_TIMEOUT_SECONDS = _BEDROCK_MAX_ATTEMPTS * (_BEDROCK_CONNECT_TIMEOUT_SECONDS + _BEDROCK_READ_TIMEOUT_SECONDS)
+
+# Bedrock error codes, lower-cased: InvokeModel reports "ThrottlingException" but response-stream
+# error events use lower camel case ("throttlingException"). A stream that breaks off mid-answer
+# is handled like a model timeout, so both move _call_with_fallback to the next model
+_THROTTLING_ERROR_CODES = frozenset(("throttlingexception",))
+_TIMEOUT_ERROR_CODES = frozenset(("modeltimeoutexception", "modelstreamerrorexception"))
+_ACCESS_DENIED_ERROR_CODES = frozenset(("accessdeniedexception",))
+
+# Upper bound on waiting for hedged categorized-analysis requests (covers client read timeout)
+_HEDGE_TIMEOUT_SECONDS = 300
+
+# Maintenance chat output budgets: replies are 2-3 sentences, so early turns need far fewer
+# tokens than deeper conversations that may summarize the issue before suggesting a ticket
+_CHAT_MAX_TOKENS_SHORT = 150
+_CHAT_MAX_TOKENS_LONG = 250
+_CHAT_DEEP_CONVERSATION_TURNS = 4
+_EXTRACTION_MAX_TOKENS = 250
+_ROLE_LABELS = {"user": "USER", "assistant": "ASSISTANT", "system": "SYSTEM"}
+
+# Long chats are sent as the opening message plus the most recent turns, so prompt size
+# (and latency/cost) stops growing with the conversation
+_CHAT_HISTORY_MAX_MESSAGES = 12
+_CHAT_HISTORY_TAIL_MESSAGES = 10
+
+# Deterministic emergency handling for maintenance chat: keyword -> category
+_EMERGENCY_KEYWORDS: Dict[str, str] = {
+    "smell gas": "gas", "gas leak": "gas", "rotten egg smell": "gas", "gas smell": "gas",
+    "smell smoke": "fire", "see smoke": "fire", "sparks": "fire", "burning smell": "fire",
+    "smoke detector": "fire", "fire alarm": "fire",
+    "co detector": "carbon_monoxide", "carbon monoxide": "carbon_monoxide",
+    "flooding": "flood", "water pouring": "flood", "ceiling bulging": "flood", "ceiling sagging": "flood",
+    "exposed wire": "electrical", "outlet hot": "electrical", "outlet burning": "electrical", "outlet spark": "electrical",
+    "no heat": "hvac", "no ac": "hvac",
+    "locked out": "lockout",
+    "can't close door": "security", "door won't lock": "security", "front door": "security",
+    "exterior door": "security", "window broken": "security", "window won't close": "security",
+}
+
+# All emergency keywords as one alternation, so a message is scanned once; when several
+# keywords match, the one listed first in _EMERGENCY_KEYWORDS decides the category
+_EMERGENCY_PATTERN = re.compile("|".join(map(re.escape, _EMERGENCY_KEYWORDS)))
+_EMERGENCY_PRIORITY = {keyword: rank for rank, keyword in enumerate(_EMERGENCY_KEYWORDS)}
+
+# Phrases that mark a plain-text (non-JSON) chat reply as recommending a ticket
+_SUGGEST_TICKET_PATTERN = re.compile(
+    "create a maintenance ticket|create a ticket|professional attention|needs a professional|call maintenance",
+    re.IGNORECASE
+)
+
+# System prompt for maintenance_chat (static, so it can be a prompt-cache prefix)
+_CHAT_SYSTEM_PROMPT = """You are a maintenance assistant. Help tenants troubleshoot issues.
+
+RESPONSE FORMAT (IMPORTANT):
+Return JSON: {"response": "your message", "suggestTicket": false}
+
+STRICT RULES:
+- ONLY discuss maintenance/property issues
+- If asked non-maintenance questions, say: "I'm here to help with maintenance issues only. Do you have a maintenance problem?"
+- "response" is plain text (your message), never JSON: {"response": "Your faucet is leaking."} not {"response": "{\\"response\\": ...}"}
+- "suggestTicket" is true when professional help needed
+- Keep responses short (2-3 sentences)
+- Ask questions to understand the issue
+- Suggest only safe solutions
+- Set suggestTicket=true after 3-4 exchanges without resolution
+- NEVER say "I'll create/submit a ticket" or "I can help submit"
+- ONLY say: "Click the red button to submit your maintenance request"
+- When ready, say EXACTLY: "Click the red button to submit your maintenance request" """
+
+# Canned responses per emergency category - returned without calling Bedrock
+_EMERGENCY_POLICIES: Dict[str, MaintenanceChatResponse] = {
+    "gas": MaintenanceChatResponse(
+        response="This could be a gas leak. Leave the unit immediately, do not use light switches, flames, or electrical devices, and call 911 or your gas company's emergency line from outside. After that, please contact your property's emergency maintenance line. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+    "fire": MaintenanceChatResponse(
+        response="This could be an emergency. If you see or smell smoke, see sparks, or feel unsafe, please call 911 or your local emergency number immediately and get to a safe place. After that, please contact your property's emergency maintenance line. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+    "carbon_monoxide": MaintenanceChatResponse(
+        response="Carbon monoxide is dangerous. Get everyone, including pets, out to fresh air right away and call 911 or your local emergency number. After that, please contact your property's emergency maintenance line. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+    "flood": MaintenanceChatResponse(
+        response="This could be an emergency. If it is safe to do so, shut off the water supply valve and keep away from any outlets or electrical devices near the water. Please contact your property's emergency maintenance line right away. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+    "electrical": MaintenanceChatResponse(
+        response="This could be an electrical hazard. Do not touch the outlet or wiring, and switch off the breaker for that area if you can do so safely. If you see sparks, smoke, or flames, call 911 immediately. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+    "hvac": MaintenanceChatResponse(
+        response="Losing heating or cooling can be urgent, especially in extreme weather. Please check that your thermostat is set correctly and the breaker has not tripped, and contact your property's emergency maintenance line if temperatures are unsafe. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+    "lockout": MaintenanceChatResponse(
+        response="Being locked out is urgent. Please contact your property's emergency maintenance line or management office for access, and call 911 if you feel unsafe. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+    "security": MaintenanceChatResponse(
+        response="A door or window that won't secure is an urgent safety issue. If you feel unsafe, please call 911 or your local emergency number, then contact your property's emergency maintenance line. Click the red button to submit your maintenance request.",
+        suggestTicket=True
+    ),
+}
+
+
+# Anthropic prompt-cache marker and billing multipliers relative to the input rate
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+_CACHE_READ_MULTIPLIER = 0.1
+_CACHE_WRITE_MULTIPLIER = 1.25
+
+# Static Llama 3 chat-template fragments
+_LLAMA_PREFIX = "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n"
+_LLAMA_MID = "<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n"
+_LLAMA_SUFFIX = "<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
+_MISTRAL_SEPARATOR = "\n\n"
+
+
+def _anthropic_system(system_prompt: str):
+    """Claude "system" field - a cache-marked text block when prompt caching is enabled"""
+    if settings.BEDROCK_PROMPT_CACHING:
+        return [{"type": "text", "text": system_prompt, "cache_control": _EPHEMERAL_CACHE}]
+    return system_prompt
+
+
+@lru_cache(maxsize=32)
+def _base_body(provider: str, system_prompt: str) -> tuple:
+    """
+    Static part of a request body for a (provider, system prompt) pair
+    
+    Only the user prompt varies between calls, so everything else is built once
+    and returned as immutable (key, value) pairs. For Llama and Mistral the
+    "prompt" entry holds the rendered prefix the user prompt is appended to.
+    Claude's "system" field can be a list of blocks, so it is not cached here.
+    """
+    if provider == "anthropic":
+        return (
+            ("anthropic_version", "bedrock-2023-05-31"),
+            ("max_tokens", 16000),
+            ("temperature", 0.1),
+        )
+    
+    if provider == "meta":
+        # Llama max_gen_len must be <= 8192
+        return (
+            ("prompt", "".join((_LLAMA_PREFIX, system_prompt, _LLAMA_MID))),
+            ("max_gen_len", 8192),
+            ("temperature", 0.1),
+            ("top_p", 0.9),
+        )
+    
+    # Mistral uses a simple combined instruction prompt; max is 8192
+    return (
+        ("prompt", system_prompt + _MISTRAL_SEPARATOR),
+        ("max_tokens", 8192),
+        ("temperature", 0.1),
+        ("top_p", 0.9),
+    )
+
+
+def _format_anthropic(system_prompt: str, user_prompt: str) -> Dict:
+    """Claude request body - the system prompt carries a cache_control marker when prompt caching is enabled"""
+    body = dict(_base_body("anthropic", system_prompt))
+    # Built per request: a cached block list would be shared by every body. The breakpoint
+    # stays on the static system prompt; the user prompt holds the per-request lease text,
+    # which would bill at the 1.25x write rate on every call and rarely be read back
+    body["system"] = _anthropic_system(system_prompt)
+    body["messages"] = [
+        {
+            "role": "user",
+            "content": user_prompt
+        }
+    ]
+    return body
+
+
+def _format_meta(system_prompt: str, user_prompt: str) -> Dict:
+    """Llama request body"""
+    body = dict(_base_body("meta", system_prompt))
+    body["prompt"] = "".join((body["prompt"], user_prompt, _LLAMA_SUFFIX))
+    return body
+
+
+def _format_mistral(system_prompt: str, user_prompt: str) -> Dict:
+    """Mistral request body"""
+    body = dict(_base_body("mistral", system_prompt))
+    body["prompt"] += user_prompt
+    return body
+
+
+def _format_converse(system_prompt: str, user_prompt: str, max_tokens: int, temperature: float) -> Dict:
+    """Converse API request - one schema for every provider"""
+    return {
+        "system": [{"text": system_prompt}],
+        "messages": [{"role": "user", "content": [{"text": user_prompt}]}],
+        "inferenceConfig": {"maxTokens": max_tokens, "temperature": temperature}
+    }
+
+
+_FORMATTERS = {
+    "anthropic": _format_anthropic,
+    "meta": _format_meta,
+    "mistral": _format_mistral,
+}
+
+
+def _windowed_history(conversation_history: List[ChatMessage]) -> List[ChatMessage]:
+    """
+    Keep the opening message and the latest turns of a long chat
+    
+    The tail is shortened by one message if needed so roles still alternate
+    after the opening message.
+    """
+    if len(conversation_history) <= _CHAT_HISTORY_MAX_MESSAGES:
+        return conversation_history
+    first = conversation_history[0]
+    tail = conversation_history[-_CHAT_HISTORY_TAIL_MESSAGES:]
+    if tail[0].role == first.role:
+        tail = tail[1:]
+    return [first, *tail]
+
+
+def _chat_transcript(conversation_history: List[ChatMessage]) -> str:
+    """Render a chat history as "ROLE: content" blocks separated by blank lines"""
+    parts = []
+    for msg in conversation_history:
+        parts.append(f"{_ROLE_LABELS.get(msg.role) or msg.role.upper()}: {msg.content}")
+    return "\n\n".join(parts)
+
+
+class _LazyJSON:
+    """Defers (size-limited) JSON serialization of a payload until a log handler formats it"""
+    
+    __slots__ = ("payload",)
+    
+    MAX_CHARS = 4000
+    
+    def __init__(self, payload):
+        self.payload = payload
+    
+    def __str__(self) -> str:
+        text = orjson.dumps(self.payload, option=orjson.OPT_INDENT_2, default=str).decode()
+        if len(text) > self.MAX_CHARS:
+            return f"{text[:self.MAX_CHARS]}... (truncated, total length: {len(text)} chars)"
+        return text
+
+
+_JSON_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class _JsonStringFieldStreamer:
+    """Decodes one top-level string field (e.g. "response") out of streamed JSON text as it arrives"""
+    
+    __slots__ = ("_key_pattern", "_buffer", "_pos", "_started", "done", "emitted")
+    
+    def __init__(self, field: str):
+        self._key_pattern = re.compile('"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self.done = False
+        self.emitted = False
+    
+    def feed(self, text: str) -> str:
+        """Consume a text delta; returns the newly decoded part of the field value (may be empty)"""
+        if self.done:
+            return ""
+        self._buffer += text
+        
+        if not self._started:
+            match = self._key_pattern.search(self._buffer)
+            if match is None:
+                return ""
+            self._started = True
+            self._pos = match.end()
+        
+        buffer = self._buffer
+        out = []
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            if char != "\\":
+                out.append(char)
+                i += 1
+                continue
+            # Escape sequence: wait for the rest of it if the delta split it
+            if i + 1 >= len(buffer):
+                break
+            code = buffer[i + 1]
+            if code == "u":
+                if i + 6 > len(buffer):
+                    break
+                point = int(buffer[i + 2:i + 6], 16)
+                if 0xD800 <= point < 0xDC00:
+                    # High surrogate: combine with the low half that follows
+                    if i + 12 > len(buffer):
+                        break
+                    point = 0x10000 + ((point - 0xD800) << 10) + (int(buffer[i + 8:i + 12], 16) - 0xDC00)
+                    i += 6
+                out.append(chr(point))
+                i += 6
+            else:
+                out.append(_JSON_SIMPLE_ESCAPES.get(code, code))
+                i += 2
+        self._pos = i
+        
+        decoded = "".join(out)
+        if decoded:
+            self.emitted = True
+        return decoded
+
+
+@lru_cache(maxsize=None)
+def _shared_runtime_client(region: str, access_key_id: Optional[str], secret_access_key: Optional[str]):
+    """
+    Build one bedrock-runtime client per region/credential set for the whole process
+    
+    boto3 clients are thread-safe and expensive to create (service model loading,
+    endpoint resolution), so every BedrockClient instance shares this one and its
+    HTTPS connection pool.
+    """
+    session_kwargs = {
+        'region_name': region
+    }
+    if access_key_id and secret_access_key:
+        session_kwargs['aws_access_key_id'] = access_key_id
+        session_kwargs['aws_secret_access_key'] = secret_access_key
+    
+    session = boto3.Session(**session_kwargs)
+    return session.client(
+        service_name='bedrock-runtime',
+        config=boto3.session.Config(
+            read_timeout=_BEDROCK_READ_TIMEOUT_SECONDS,
+            connect_timeout=_BEDROCK_CONNECT_TIMEOUT_SECONDS,
+            retries={'max_attempts': _BEDROCK_MAX_ATTEMPTS, 'mode': 'adaptive'},
+            max_pool_connections=50,  # Concurrent analyses reuse warm TLS connections
+            tcp_keepalive=True  # Keep idle pooled connections from being dropped between requests
+        )
+    )
+
+
+# Context window by provider reported in model metadata (all Bedrock Claude models have 200k)
+_CONTEXT_LENGTHS = {"anthropic": 200000}
+_DEFAULT_CONTEXT_LENGTH = 128000
+
+
+@lru_cache(maxsize=1)
+def _available_models() -> tuple:
+    """Model metadata for get_available_models, built once (settings and pricing are static)"""
+    models = []
+    
+    for model_id in settings.ALL_MODELS:
+        pricing = BedrockClient.MODEL_PRICING.get(
+            model_id,
+            {"input": 0, "output": 0}
+        )
+        
+        # Extract provider from model ID (e.g., "anthropic" from "anthropic.claude...")
+        provider = model_id.split(".")[0]
+        
+        models.append({
+            "model_id": model_id,
+            "name": model_id.split(".")[-1],  # Get model name after last dot
+            "provider": provider,
+            "has_native_search": False,  # Bedrock has no native search
+            "estimated_cost_per_1k_tokens": pricing,
+            "context_length": _CONTEXT_LENGTHS.get(provider_for(model_id), _DEFAULT_CONTEXT_LENGTH)
+        })
+    
+    return tuple(models)
+
 
 class BedrockClient:
     """Client for interacting with AWS Bedrock API with timeout and retry support"""
@@ -61,29 +453,16 @@ class BedrockClient:
         Uses AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY from settings for local testing
         """
         try:
-            # Configure boto3 client
-            session_kwargs = {
-                'region_name': settings.AWS_REGION
-            }
-            
             # Add credentials if provided (for local testing)
             if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
                 logger.info("Using AWS credentials from environment variables")
-                session_kwargs['aws_access_key_id'] = settings.AWS_ACCESS_KEY_ID
-                session_kwargs['aws_secret_access_key'] = settings.AWS_SECRET_ACCESS_KEY
             else:
                 logger.info("Using IAM role credentials (EC2)")
             
-            # Create boto3 session and client
-            session = boto3.Session(**session_kwargs)
-            
-            self.client = session.client(
-                service_name='bedrock-runtime',
-                config=boto3.session.Config(
-                    read_timeout=180,
-                    connect_timeout=10,
-                    retries={'max_attempts': 2, 'mode': 'adaptive'}
-                )
+            self.client = _shared_runtime_client(
+                settings.AWS_REGION,
+                settings.AWS_ACCESS_KEY_ID or None,
+                settings.AWS_SECRET_ACCESS_KEY or None
             )
             
             logger.info(f"Bedrock client initialized for region: {settings.AWS_REGION}")
@@ -106,16 +485,25 @@ class BedrockClient:
         Returns:
             Cleaned JSON string safe for parsing
         """
-        sanitized = ""
-        for char in json_str:
-            code = ord(char)
-            if code >= 32:
-                sanitized += char
-            elif code in [9, 10, 13]:
-                sanitized += char
+        return json_str.translate(BAD_CTRL)
+    
+    def _parse_json(self, json_str: str):
+        """
+        Parse model JSON, sanitizing control characters only if the first parse fails
         
-        sanitized = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F]', '', sanitized)
-        return sanitized
+        Args:
+            json_str: JSON string extracted from a model response
+            
+        Returns:
+            Parsed JSON value
+            
+        Raises:
+            json.JSONDecodeError: If the string is invalid even after sanitizing
+        """
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            return orjson.loads(self._sanitize_json_string(json_str))
     
     def _extract_json_from_markdown(self, text: str) -> Optional[str]:
         """
@@ -127,25 +515,22 @@ class BedrockClient:
         Returns:
             Extracted JSON string or None if not found
         """
-        json_block_patterns = [
-            r'```json\s*(\{.*?\})\s*```',
-            r'```\s*(\{.*?\})\s*```',
-        ]
-        
-        for pattern in json_block_patterns:
-            match = re.search(pattern, text, re.DOTALL)
-            if match:
-                logger.info("Found JSON within markdown code block")
-                json_str = match.group(1).strip()
-                return self._fix_truncated_json(json_str)
-        
-        incomplete_pattern = r'```(?:json)?\s*(\{.*)'
-        match = re.search(incomplete_pattern, text, re.DOTALL)
-        if match:
-            logger.warning("Found incomplete markdown block")
-            json_str = match.group(1).strip()
-            json_str = re.sub(r'```\s*$', '', json_str)
-            return self._fix_truncated_json(json_str)
+        # Prefer a ```json fence, then any code fence
+        fence = text.find("```json")
+        if fence == -1:
+            fence = text.find("```")
+        
+        if fence != -1:
+            json_start = text.find("{", fence)
+            if json_start != -1:
+                json_end = scan_json_block(text, json_start)
+                if json_end is not None:
+                    logger.info("Found JSON within markdown code block")
+                    return fix_truncated_json(text[json_start:json_end])
+                
+                logger.warning("Found incomplete markdown block")
+                json_str = _TRAILING_FENCE.sub('', text[json_start:].strip())
+                return fix_truncated_json(json_str)
         
         json_start = text.find("{")
         json_end = text.rfind("}") + 1
@@ -153,43 +538,11 @@ class BedrockClient:
         if json_start != -1 and json_end > json_start:
             logger.info("Found JSON without markdown code block")
             json_str = text[json_start:json_end].strip()
-            return self._fix_truncated_json(json_str)
+            return fix_truncated_json(json_str)
         
         logger.error("Could not find JSON in response")
         return None
     
-    def _fix_truncated_json(self, json_str: str) -> str:
-        """
-        Attempt to fix truncated/incomplete JSON
-        
-        Args:
-            json_str: Potentially truncated JSON string
-            
-        Returns:
-            Fixed JSON string
-        """
-        open_braces = json_str.count('{')
-        close_braces = json_str.count('}')
-        open_brackets = json_str.count('[')
-        close_brackets = json_str.count(']')
-        
-        if open_braces == close_braces and open_brackets == close_brackets:
-            return json_str
-        
-        logger.warning(f"JSON appears truncated: {{ {open_braces}/{close_braces}, [ {open_brackets}/{close_brackets}")
-        
-        json_str = re.sub(r',?\s*"[^"]*$', '', json_str)
-        
-        while open_brackets > close_brackets:
-            json_str += ']'
-            close_brackets += 1
-        
-        while open_braces > close_braces:
-            json_str += '}'
-            close_braces += 1
-        
-        return json_str
-    
     def _format_messages_for_bedrock(self, model_id: str, system_prompt: str, user_prompt: str) -> Dict:
         """
         Format messages according to model-specific requirements
@@ -202,56 +555,14 @@ class BedrockClient:
         Returns:
             Formatted request body for the specific model
         """
-        # Handle inference profile IDs (us.provider.model) by extracting provider
-        if model_id.startswith("us."):
-            # Extract provider from inference profile ID: us.anthropic.claude... -> anthropic
-            provider = model_id.split(".")[1]
-        elif "." in model_id:
-            # Direct model ID: anthropic.claude... -> anthropic
-            provider = model_id.split(".")[0]
-        else:
-            provider = model_id
-        
-        if provider == "anthropic":
-            # Claude format
-            return {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 16000,
-                "temperature": 0.1,
-                "system": system_prompt,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ]
-            }
-        
-        elif provider == "meta":
-            # Llama format - max_gen_len must be <= 8192
-            return {
-                "prompt": f"<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n{system_prompt}<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{user_prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n",
-                "max_gen_len": 8192,
-                "temperature": 0.1,
-                "top_p": 0.9
-            }
-        
-        elif provider == "mistral":
-            # Mistral format for AWS Bedrock
-            # Mistral uses a simple prompt with instruction format
-            combined_prompt = f"{system_prompt}\n\n{user_prompt}"
-            return {
-                "prompt": combined_prompt,
-                "max_tokens": 8192,  # Mistral max is 8192
-                "temperature": 0.1,
-                "top_p": 0.9
-            }
-        
-        else:
+        formatter = _FORMATTERS.get(provider_for(model_id))
+        if formatter is None:
             raise AIModelError(
                 message=f"Unsupported model: {model_id}",
                 details="Model format not recognized"
             )
+        
+        return formatter(system_prompt, user_prompt)
     
     def _extract_text_from_response(self, model_id: str, response_body: Dict) -> str:
         """
@@ -264,13 +575,7 @@ class BedrockClient:
         Returns:
             Generated text content
         """
-        # Handle inference profile IDs (us.provider.model) by extracting provider
-        if model_id.startswith("us."):
-            provider = model_id.split(".")[1]
-        elif "." in model_id:
-            provider = model_id.split(".")[0]
-        else:
-            provider = model_id
+        provider = provider_for(model_id)
         
         try:
             if provider == "anthropic":
@@ -293,7 +598,7 @@ class BedrockClient:
                 
         except KeyError as e:
             logger.error(f"Failed to extract text from response: {str(e)}")
-            logger.error(f"Response body: {json.dumps(response_body, indent=2)}")
+            logger.error("Response body: %s", _LazyJSON(response_body))
             raise AIModelError(
                 message="Failed to parse model response",
                 details=f"Missing expected key: {str(e)}"
@@ -310,19 +615,25 @@ class BedrockClient:
         Returns:
             Dictionary with prompt, completion, and total tokens
         """
-        # Handle inference profile IDs (us.provider.model) by extracting provider
-        if model_id.startswith("us."):
-            provider = model_id.split(".")[1]
-        elif "." in model_id:
-            provider = model_id.split(".")[0]
-        else:
-            provider = model_id
+        provider = provider_for(model_id)
         
         try:
             if provider == "anthropic":
                 usage = response_body.get('usage', {})
-                prompt_tokens = usage.get('input_tokens', 0)
+                cache_read_tokens = usage.get('cache_read_input_tokens', 0)
+                cache_write_tokens = usage.get('cache_creation_input_tokens', 0)
+                # input_tokens excludes the cached portion of the prompt
+                prompt_tokens = usage.get('input_tokens', 0) + cache_read_tokens + cache_write_tokens
                 completion_tokens = usage.get('output_tokens', 0)
+                
+                if cache_read_tokens or cache_write_tokens:
+                    return {
+                        "prompt": prompt_tokens,
+                        "completion": completion_tokens,
+                        "total": prompt_tokens + completion_tokens,
+                        "cache_read": cache_read_tokens,
+                        "cache_write": cache_write_tokens
+                    }
             
             elif provider == "meta":
                 prompt_tokens = response_body.get('prompt_token_count', 0)
@@ -346,13 +657,75 @@ class BedrockClient:
             logger.warning(f"Failed to extract token usage: {str(e)}")
             return {"prompt": 0, "completion": 0, "total": 0}
     
-    def _call_bedrock_with_retry(self, model_id: str, body: Dict) -> tuple[str, Dict[str, int]]:
+    def _invoke_streaming(self, model_id: str, body: Dict) -> tuple[str, Dict[str, int]]:
+        """
+        Invoke model with response streaming, keeping the text up to the end of the JSON answer
+        
+        Args:
+            model_id: Bedrock model identifier
+            body: Request body formatted for the specific model
+            
+        Returns:
+            Tuple of (response_text, token_usage) from read_response_stream
+        """
+        response = self.client.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=orjson.dumps(body)
+        )
+        return read_response_stream(response['body'], provider_for(model_id))
+    
+    def _invoke_converse(self, model_id: str, request: Dict) -> tuple[str, Dict[str, int]]:
+        """
+        Invoke model through the provider-agnostic Converse API
+        
+        Args:
+            model_id: Bedrock model identifier
+            request: Converse request built by _format_converse
+            
+        Returns:
+            Tuple of (response_text, token_usage)
+        """
+        response = self.client.converse(modelId=model_id, **request)
+        
+        try:
+            text = response['output']['message']['content'][0]['text']
+        except (KeyError, IndexError) as e:
+            logger.error(f"Failed to extract text from Converse response: {str(e)}")
+            raise AIModelError(
+                message="Failed to parse model response",
+                details=f"Missing expected key: {str(e)}"
+            )
+        
+        usage = response.get('usage', {})
+        prompt_tokens = usage.get('inputTokens', 0)
+        completion_tokens = usage.get('outputTokens', 0)
+        return text, {
+            "prompt": prompt_tokens,
+            "completion": completion_tokens,
+            "total": prompt_tokens + completion_tokens
+        }
+    
+    def _invoke_bedrock(
+        self,
+        model_id: str,
+        body: Dict,
+        stream: bool = False,
+        converse: bool = False
+    ) -> tuple[str, Dict[str, int]]:
         """
-        Call Bedrock API with retry logic
+        Call Bedrock API
+        
+        Throttling and transient network/timeout errors are retried by botocore's
+        adaptive retry mode (configured on the client), which rate-limits across
+        threads; errors that reach this method are translated once.
         
         Args:
             model_id: Bedrock model identifier
             body: Request body formatted for the specific model
+            stream: Use response streaming and keep only the text up to the end of the JSON
+                answer (falls back to a regular invocation for providers without a stream parser)
+            converse: body is a Converse API request (see _format_converse) rather than
+                a provider-specific InvokeModel body
             
         Returns:
             Tuple of (response_text, token_usage)
@@ -361,78 +734,134 @@ class BedrockClient:
             AITimeoutError: If request times out
             AIModelError: If API returns an error
         """
-        max_retries = 3
-        last_error = None
-        
-        for attempt in range(max_retries):
-            try:
-                # Call Bedrock API
-                response = self.client.invoke_model(
-                    modelId=model_id,
-                    body=json.dumps(body)
-                )
-                
-                # Parse response
-                response_body = json.loads(response['body'].read())
-                
-                # Extract text and tokens
-                text = self._extract_text_from_response(model_id, response_body)
-                tokens = self._get_token_usage(model_id, response_body)
-                
-                return text, tokens
-                
-            except (ReadTimeoutError, ConnectTimeoutError) as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Bedrock timeout on attempt {attempt + 1}, retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    raise AITimeoutError(timeout_seconds=120)
-                    
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                error_message = e.response['Error']['Message']
+        try:
+            if converse:
+                return self._invoke_converse(model_id, body)
+            
+            if stream and provider_for(model_id) in STREAM_DELTA_EXTRACTORS:
+                return self._invoke_streaming(model_id, body)
+            
+            # Call Bedrock API
+            response = self.client.invoke_model(
+                modelId=model_id,
+                body=orjson.dumps(body)
+            )
+            
+            # Parse response
+            response_body = orjson.loads(response['body'].read())
+            
+            # Extract text and tokens
+            text = self._extract_text_from_response(model_id, response_body)
+            tokens = self._get_token_usage(model_id, response_body)
+            
+            return text, tokens
+            
+        except (ReadTimeoutError, ConnectTimeoutError) as e:
+            logger.warning(f"Bedrock timeout after client retries: {str(e)}")
+            raise AITimeoutError(timeout_seconds=_BEDROCK_TIMEOUT_SECONDS)
                 
-                if error_code == 'ThrottlingException':
-                    if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt
-                        logger.warning(f"Bedrock throttled, retrying in {wait_time}s...")
-                        time.sleep(wait_time)
-                    else:
-                        raise AIModelError(
-                            message="AWS Bedrock rate limit exceeded",
-                            details="Too many requests. Please try again later."
-                        )
-                elif error_code == 'ModelTimeoutException':
-                    raise AITimeoutError(timeout_seconds=120)
-                elif error_code == 'AccessDeniedException':
-                    raise AIModelError(
-                        message="Access denied to AWS Bedrock",
-                        details="Check IAM permissions or enable model access in AWS Console"
-                    )
-                else:
-                    # Log the full error details for debugging
-                    logger.error(f"Bedrock ValidationException details: {error_message}")
-                    logger.error(f"Request body: {json.dumps(body, indent=2)}")
-                    raise AIModelError(
-                        message=f"AWS Bedrock error: {error_code}",
-                        details=error_message
-                    )
-                    
-            except Exception as e:
-                logger.error(f"Unexpected Bedrock error: {str(e)}")
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            normalized_code = error_code.lower()
+            
+            if normalized_code in _THROTTLING_ERROR_CODES:
+                raise AIThrottlingError(
+                    details="Too many requests. Please try again later."
+                )
+            elif normalized_code in _TIMEOUT_ERROR_CODES:
+                logger.warning(f"Bedrock {error_code}: {error_message}")
+                raise AITimeoutError(timeout_seconds=_BEDROCK_TIMEOUT_SECONDS)
+            elif normalized_code in _ACCESS_DENIED_ERROR_CODES:
+                raise AIAccessDeniedError(
+                    details="Check IAM permissions or enable model access in AWS Console"
+                )
+            else:
+                # Log the full error details for debugging
+                logger.error(f"Bedrock ValidationException details: {error_message}")
+                logger.error("Request body: %s", _LazyJSON(body))
                 raise AIModelError(
-                    message="Unexpected AWS Bedrock error",
-                    details=str(e)
+                    message=f"AWS Bedrock error: {error_code}",
+                    details=error_message
                 )
-        
-        if last_error:
+                
+        except Exception as e:
+            logger.error(f"Unexpected Bedrock error: {str(e)}")
             raise AIModelError(
-                message="AWS Bedrock failed after retries",
-                details=str(last_error)
+                message="Unexpected AWS Bedrock error",
+                details=str(e)
             )
     
+    # Models that returned AccessDeniedException; model access does not change while the process runs
+    _denied_models: set = set()
+    
+    # Guards _denied_models and _circuit, shared by every request thread
+    _model_state_lock = threading.Lock()
+    
+    @classmethod
+    def clear_denylist(cls) -> None:
+        """Forget models previously denied by Bedrock (e.g. after enabling model access)"""
+        with cls._model_state_lock:
+            cls._denied_models.clear()
+    
+    # Per-model circuit breaker for _call_with_fallback: model_id -> (open_until, consecutive_failures)
+    _circuit: Dict[str, tuple] = {}
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_COOLDOWN_SECONDS = 30.0
+    
+    def _call_with_fallback(self, body_for_model, models: Optional[List[str]] = None) -> tuple[str, Dict[str, int]]:
+        """
+        Call Bedrock, moving down a model chain when a model is throttled, timing out or denied
+        
+        A model that fails CIRCUIT_FAILURE_THRESHOLD times in a row is skipped for
+        CIRCUIT_COOLDOWN_SECONDS instead of being retried. If every model is skipped
+        the full chain is tried anyway.
+        
+        Args:
+            body_for_model: Callable returning the request body for a given model ID
+            models: Model chain to try (defaults to FREE_MODEL followed by FALLBACK_MODELS)
+            
+        Returns:
+            Tuple of (response_text, token_usage)
+            
+        Raises:
+            AIModelError: The error from the last model tried, or any non-transient error
+        """
+        chain = models or [settings.FREE_MODEL, *settings.FALLBACK_MODELS]
+        now = time.monotonic()
+        with self._model_state_lock:
+            candidates = [
+                m for m in chain
+                if m not in self._denied_models and self._circuit.get(m, (0.0, 0))[0] <= now
+            ] or chain
+        
+        last_error: Optional[AIModelError] = None
+        for model_id in candidates:
+            try:
+                result = self._invoke_bedrock(model_id, body_for_model(model_id))
+            except AIAccessDeniedError as e:
+                with self._model_state_lock:
+                    self._denied_models.add(model_id)
+                last_error = e
+            except (AIThrottlingError, AITimeoutError) as e:
+                with self._model_state_lock:
+                    _, failures = self._circuit.get(model_id, (0.0, 0))
+                    failures += 1
+                    open_until = time.monotonic() + self.CIRCUIT_COOLDOWN_SECONDS if failures >= self.CIRCUIT_FAILURE_THRESHOLD else 0.0
+                    self._circuit[model_id] = (open_until, failures)
+                last_error = e
+            else:
+                with self._model_state_lock:
+                    self._circuit.pop(model_id, None)
+                return result
+            logger.warning("Model %s unavailable (%s), trying next in chain", model_id, last_error.message)
+        
+        raise last_error
+    
+    # Delay between application-level retries of invalid model responses
+    BASE_BACKOFF_SECONDS = 0.1
+    MAX_BACKOFF_SECONDS = 8.0
+    
     # AWS Bedrock Pricing per 1M tokens (as of December 2025)
     MODEL_PRICING = {
         # Anthropic Claude
@@ -452,6 +881,12 @@ class BedrockClient:
         "mistral.mistral-small-2402-v1:0": {"input": 0.2, "output": 0.6},
     }
     
+    # Per-token (input, output) rates derived from MODEL_PRICING (USD per 1M tokens)
+    _RATE = {
+        model: (price["input"] * 1e-6, price["output"] * 1e-6)
+        for model, price in MODEL_PRICING.items()
+    }
+    
     def analyze_lease_with_search(
         self,
         model_name: str,
@@ -478,6 +913,7 @@ class BedrockClient:
         
         try:
             # Build prompt
+            from app.prompts.lease_analysis_prompts import build_lease_analysis_prompt
             prompt = build_lease_analysis_prompt(lease_info, search_results, use_native_search=False)
             
             # Format request for Bedrock
@@ -487,8 +923,8 @@ class BedrockClient:
                 user_prompt=prompt
             )
             
-            # Make API call
-            response_text, tokens_used = self._call_bedrock_with_retry(model_name, body)
+            # Make API call (streamed; text after the JSON answer closes is ignored)
+            response_text, tokens_used = self._invoke_bedrock(model_name, body, stream=True)
             
             # Parse response
             violations, extracted_lease_info = self._parse_violations_from_response(response_text)
@@ -518,18 +954,31 @@ class BedrockClient:
             elapsed_time = time.time() - start_time
             cost = self._calculate_cost(model_name, tokens_used)
             
-            metrics = AnalysisMetrics(
+            # Aggregate citation/confidence stats in a single pass
+            gov_citations = 0
+            total_citations = 0
+            confidence_total = 0.0
+            has_law_references = False
+            for v in violations:
+                confidence_total += v.confidence_score
+                for c in v.citations:
+                    total_citations += 1
+                    if c.is_gov_site:
+                        gov_citations += 1
+                    if not has_law_references and c.law_reference:
+                        has_law_references = True
+            
+            # Every field is computed here with the right type, so skip validation
+            metrics = AnalysisMetrics.model_construct(
                 model_name=model_name,
                 search_strategy=SearchStrategy.DUCKDUCKGO_SEARCH,  # Bedrock always uses DuckDuckGo
                 total_time_seconds=elapsed_time,
                 cost_usd=cost,
-                gov_citations_count=sum(1 for v in violations for c in v.citations if c.is_gov_site),
-                total_citations_count=sum(len(v.citations) for v in violations),
+                gov_citations_count=gov_citations,
+                total_citations_count=total_citations,
                 violations_found=len(violations),
-                avg_confidence_score=sum(v.confidence_score for v in violations) / len(violations) if violations else 0,
-                has_law_references=any(
-                    c.law_reference for v in violations for c in v.citations
-                ),
+                avg_confidence_score=confidence_total / len(violations) if violations else 0.0,
+                has_law_references=has_law_references,
                 tokens_used=tokens_used
             )
             
@@ -538,34 +987,43 @@ class BedrockClient:
         except Exception as e:
             logger.error(f"Error analyzing with {model_name}: {str(e)}")
             
-            elapsed_time = time.time() - start_time
-            metrics = AnalysisMetrics(
-                model_name=model_name,
-                search_strategy=SearchStrategy.DUCKDUCKGO_SEARCH,
-                total_time_seconds=elapsed_time,
-                cost_usd=0.0,
-                gov_citations_count=0,
-                total_citations_count=0,
-                violations_found=0,
-                avg_confidence_score=0.0,
-                has_law_references=False,
-                tokens_used={"prompt": 0, "completion": 0, "total": 0}
-            )
-            
+            metrics = self._error_metrics(model_name, time.time() - start_time)
             return [], metrics, None
     
+    @staticmethod
+    def _error_metrics(model_name: str, elapsed_time: float) -> AnalysisMetrics:
+        """Zeroed metrics for a failed analysis (constructed without validation)"""
+        return AnalysisMetrics.model_construct(
+            model_name=model_name,
+            search_strategy=SearchStrategy.DUCKDUCKGO_SEARCH,
+            total_time_seconds=elapsed_time,
+            cost_usd=0.0,
+            gov_citations_count=0,
+            total_citations_count=0,
+            violations_found=0,
+            avg_confidence_score=0.0,
+            has_law_references=False,
+            tokens_used={"prompt": 0, "completion": 0, "total": 0}
+        )
+    
     def _calculate_cost(self, model_name: str, tokens_used: Dict[str, int]) -> float:
         """Calculate cost for the API call based on token usage"""
-        if model_name not in self.MODEL_PRICING:
+        rates = self._RATE.get(model_name)
+        if rates is None:
             logger.warning(f"No pricing info for model: {model_name}")
             return 0.0
         
-        pricing = self.MODEL_PRICING[model_name]
-        
-        input_cost = (tokens_used.get("prompt", 0) / 1_000_000) * pricing["input"]
-        output_cost = (tokens_used.get("completion", 0) / 1_000_000) * pricing["output"]
-        
-        return input_cost + output_cost
+        input_rate, output_rate = rates
+        cache_read = tokens_used.get("cache_read", 0)
+        cache_write = tokens_used.get("cache_write", 0)
+        uncached = tokens_used.get("prompt", 0) - cache_read - cache_write
+        
+        input_cost = (
+            uncached
+            + cache_read * _CACHE_READ_MULTIPLIER
+            + cache_write * _CACHE_WRITE_MULTIPLIER
+        ) * input_rate
+        return input_cost + tokens_used.get("completion", 0) * output_rate
     
     def _parse_violations_from_response(self, response_text: str) -> tuple[List[Violation], Optional[Dict[str, str]]]:
         """Parse violations and lease info from model response"""
@@ -573,33 +1031,25 @@ class BedrockClient:
         lease_info_data = None
         
         try:
-            logger.info("="*80)
+            logger.info(_BANNER)
             logger.info("PARSING VIOLATIONS RESPONSE")
             logger.info(f"Response length: {len(response_text)} characters")
-            logger.info("="*80)
+            logger.info(_BANNER)
             
             # Extract JSON from response (may be wrapped in markdown)
-            json_str = response_text
-            if "```json" in response_text:
-                logger.info("Found ```json marker, extracting...")
-                json_str = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                logger.info("Found ``` marker, extracting...")
-                json_str = response_text.split("```")[1].split("```")[0]
-            else:
-                logger.info("No code blocks found, using full response")
-            
-            # Sanitize JSON string to remove invalid control characters
-            json_str = self._sanitize_json_string(json_str.strip())
+            json_str = self._extract_json_from_markdown(response_text)
+            if json_str is None:
+                logger.error(f"Response preview: {response_text[:500]}")
+                return violations, lease_info_data
             
-            # Log sanitized JSON for debugging
-            logger.info("SANITIZED JSON STRING:")
+            # Log extracted JSON for debugging
+            logger.info("EXTRACTED JSON STRING:")
             logger.info(json_str[:1000] if len(json_str) > 1000 else json_str)
             if len(json_str) > 1000:
                 logger.info(f"... (truncated, total length: {len(json_str)} chars)")
-            logger.info("="*80)
+            logger.info(_BANNER)
             
-            data = json.loads(json_str)
+            data = self._parse_json(json_str)
             logger.info("JSON PARSED SUCCESSFULLY!")
             logger.info(f"Found {len(data.get('violations', []))} violations")
             
@@ -631,162 +1081,226 @@ class BedrockClient:
                     continue
         
         except json.JSONDecodeError as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"JSON DECODE ERROR: {str(e)}")
             logger.error(f"Error at position: {e.pos if hasattr(e, 'pos') else 'unknown'}")
             logger.error(f"Response text (first 500 chars): {response_text[:500]}")
-            logger.error("="*80)
+            logger.error(_BANNER)
         except Exception as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"UNEXPECTED ERROR: {str(e)}")
             logger.error(f"Error type: {type(e).__name__}")
             logger.error(f"Response text (first 500 chars): {response_text[:500]}")
-            logger.error("="*80)
+            logger.error(_BANNER)
+        
+        return violations, lease_info_data
+    
+    def analyze_lease_categorized(
+        self,
+        lease_info: LeaseInfo
+    ) -> tuple[Dict[str, List[CategorizedViolation]], AnalysisMetrics, Optional[Dict[str, str]]]:
+        """
+        Analyze lease for violations using Claude 3.5 Haiku and categorize them.
+        
+        Args:
+            lease_info: Extracted lease information
+            
+        Returns:
+            Tuple of (violations by category dict, metrics, location dict extracted by model)
+        """
+        # Try Claude 3.5 Haiku first, fallback to Llama 70B if not accessible
+        models_to_try = [
+            "us.anthropic.claude-3-5-haiku-20241022-v1:0",  # Best for consistency
+            "us.meta.llama3-1-70b-instruct-v1:0"  # Fallback if Claude not enabled
+        ]
+        
+        # Skip models Bedrock already refused in this process (re-probe them if every model was refused)
+        with self._model_state_lock:
+            models_to_try = [m for m in models_to_try if m not in self._denied_models] or models_to_try
+        
+        start_time = time.time()
+        model_name = models_to_try[0]
+        result = None
+        last_error = None
+        
+        if settings.CATEGORIZED_ANALYSIS_HEDGE:
+            # Query all models concurrently and keep the first valid response
+            model_name, result, last_error = self._hedge_categorized_analysis(models_to_try, lease_info)
+        else:
+            # Try each model until one works
+            for model_name in models_to_try:
+                result, last_error = self._analyze_categorized_with_model(model_name, lease_info)
+                if result:
+                    break
+        
+        # If successful, calculate metrics and return
+        if result:
+            categorized_violations, lease_info_data, tokens_used = result
+            elapsed_time = time.time() - start_time
+            
+            # Aggregate violation/citation stats across categories in a single pass
+            violations_found = 0
+            gov_citations = 0
+            total_citations = 0
+            confidence_total = 0.0
+            has_law_references = False
+            for violations_list in categorized_violations.values():
+                for v in violations_list:
+                    violations_found += 1
+                    confidence_total += v.confidence_score
+                    for c in v.citations:
+                        total_citations += 1
+                        if c.is_gov_site:
+                            gov_citations += 1
+                        if not has_law_references and c.law_reference:
+                            has_law_references = True
+            
+            metrics = AnalysisMetrics.model_construct(
+                model_name=model_name,
+                search_strategy=SearchStrategy.DUCKDUCKGO_SEARCH,  # Bedrock always uses DuckDuckGo
+                total_time_seconds=elapsed_time,
+                cost_usd=self._calculate_cost(model_name, tokens_used),
+                gov_citations_count=gov_citations,
+                total_citations_count=total_citations,
+                violations_found=violations_found,
+                avg_confidence_score=confidence_total / violations_found if violations_found else 0.0,
+                has_law_references=has_law_references,
+                tokens_used=tokens_used
+            )
+            
+            # Return successful result
+            return categorized_violations, metrics, lease_info_data
+        
+        # If we get here, all models failed
+        logger.error(f"All retries failed. Last error: {str(last_error)}")
+        
+        # Return empty result with error metrics
+        metrics = self._error_metrics(model_name, time.time() - start_time)
+        return {}, metrics, None
+    
+    def _analyze_categorized_with_model(
+        self,
+        model_name: str,
+        lease_info: LeaseInfo,
+        max_retries: int = 3
+    ) -> tuple[Optional[tuple[Dict[str, List[CategorizedViolation]], Optional[Dict[str, str]], Dict[str, int]]], Optional[Exception]]:
+        """
+        Run categorized analysis against a single model, retrying invalid or failed responses.
+        
+        Args:
+            model_name: Bedrock model identifier
+            lease_info: Extracted lease information
+            max_retries: Attempts before giving up on this model
+            
+        Returns:
+            Tuple of ((violations by category, lease info dict, tokens used) or None, last error)
+        """
+        from app.prompts.lease_analysis_prompts import (
+            build_categorized_analysis_prompt,
+            CATEGORIZED_ANALYSIS_SYSTEM_PROMPT
+        )
+        
+        logger.info(f"Attempting categorized analysis with {model_name}")
+        last_error = None
+        
+        for attempt in range(max_retries):
+            try:
+                # Build categorized analysis prompt
+                logger.info(f"Building prompt for {model_name} (attempt {attempt + 1}/{max_retries})")
+                prompt = build_categorized_analysis_prompt(lease_info)
+                logger.info(f"Prompt size: {len(prompt)} characters")
+                
+                # Format request for Bedrock with strict JSON instructions
+                body = self._format_messages_for_bedrock(
+                    model_id=model_name,
+                    system_prompt=CATEGORIZED_ANALYSIS_SYSTEM_PROMPT,
+                    user_prompt=prompt
+                )
+                
+                # Make API call
+                logger.info(f"Calling AWS Bedrock with {model_name}...")
+                response_text, tokens_used = self._invoke_bedrock(model_name, body, stream=True)
+                logger.info(f"Received response: {len(response_text)} characters, tokens used: {tokens_used}")
+                
+                # Parse violations and lease info with improved JSON extraction
+                logger.info("Parsing AI response for violations and location data...")
+                categorized_violations, lease_info_data = self._parse_categorized_violations(response_text)
+                
+                # Validate response has all required fields
+                if self._validate_categorized_response(categorized_violations, lease_info_data):
+                    logger.info(f"Successfully completed analysis with {model_name}")
+                    return (categorized_violations, lease_info_data, tokens_used), None
+                
+                logger.warning(f"Attempt {attempt + 1}: Invalid response structure, retrying...")
+                last_error = Exception("Invalid response structure")
+                    
+            except json.JSONDecodeError as e:
+                last_error = e
+                logger.warning(f"Attempt {attempt + 1}: JSON parse error: {str(e)}")
+            except AIAccessDeniedError as e:
+                # Retrying can never succeed - remember it and move straight to the next model
+                last_error = e
+                with self._model_state_lock:
+                    self._denied_models.add(model_name)
+                logger.warning(f"Access denied to {model_name}, trying next model...")
+                break
+            except (AIThrottlingError, AITimeoutError) as e:
+                # botocore has already retried these with backoff; fall back instead
+                last_error = e
+                logger.warning(f"{model_name} throttled or timed out after client retries, trying next model...")
+                break
+            except AIModelError as e:
+                last_error = e
+                logger.error(f"Attempt {attempt + 1}: Error: {str(e)}")
+                if attempt < max_retries - 1:
+                    time.sleep(self._retry_backoff(attempt))
+            except Exception as e:
+                last_error = e
+                logger.error(f"Attempt {attempt + 1}: Error in categorized analysis: {str(e)}")
+                if attempt < max_retries - 1:
+                    time.sleep(self._retry_backoff(attempt))  # Brief delay before retry
         
-        return violations, lease_info_data
+        return None, last_error
     
-    def analyze_lease_categorized(
+    def _retry_backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given (0-based) attempt, capped at MAX_BACKOFF_SECONDS"""
+        return min(self.MAX_BACKOFF_SECONDS, self.BASE_BACKOFF_SECONDS * (2 ** attempt) + random.random() * 0.05)
+    
+    def _hedge_categorized_analysis(
         self,
+        models: List[str],
         lease_info: LeaseInfo
-    ) -> tuple[Dict[str, List[CategorizedViolation]], AnalysisMetrics, Optional[Dict[str, str]]]:
+    ) -> tuple[str, Optional[tuple[Dict[str, List[CategorizedViolation]], Optional[Dict[str, str]], Dict[str, int]]], Optional[Exception]]:
         """
-        Analyze lease for violations using Claude 3.5 Haiku and categorize them.
+        Run categorized analysis on all models concurrently and keep the first valid result.
+        
+        The slower request is abandoned rather than interrupted (boto3 calls cannot be
+        cancelled mid-flight), so its tokens are still billed.
         
-        Args:
-            lease_info: Extracted lease information
-            
         Returns:
-            Tuple of (violations by category dict, metrics, location dict extracted by model)
+            Tuple of (winning model, result or None, last error)
         """
-        # Try Claude 3.5 Haiku first, fallback to Llama 70B if not accessible
-        models_to_try = [
-            "us.anthropic.claude-3-5-haiku-20241022-v1:0",  # Best for consistency
-            "us.meta.llama3-1-70b-instruct-v1:0"  # Fallback if Claude not enabled
-        ]
-        
-        start_time = time.time()
-        max_retries = 3
+        executor = ThreadPoolExecutor(max_workers=len(models))
+        futures = {
+            executor.submit(self._analyze_categorized_with_model, model, lease_info): model
+            for model in models
+        }
         last_error = None
-        model_name = None
-        
-        # Try each model until one works
-        for model_to_test in models_to_try:
-            model_name = model_to_test
-            logger.info(f"Attempting categorized analysis with {model_name}")
-            
-            for attempt in range(max_retries):
-                try:
-                    # Build categorized analysis prompt
-                    logger.info(f"Building prompt for {model_name} (attempt {attempt + 1}/{max_retries})")
-                    prompt = build_categorized_analysis_prompt(lease_info)
-                    logger.info(f"Prompt size: {len(prompt)} characters")
-                    
-                    # Format request for Bedrock with strict JSON instructions
-                    system_prompt = CATEGORIZED_ANALYSIS_SYSTEM_PROMPT
-                    
-                    body = self._format_messages_for_bedrock(
-                        model_id=model_name,
-                        system_prompt=system_prompt,
-                        user_prompt=prompt
-                    )
-                    
-                    # Make API call
-                    logger.info(f"Calling AWS Bedrock with {model_name}...")
-                    response_text, tokens_used = self._call_bedrock_with_retry(model_name, body)
-                    logger.info(f"Received response: {len(response_text)} characters, tokens used: {tokens_used}")
-                    
-                    # Parse violations and lease info with improved JSON extraction
-                    logger.info("Parsing AI response for violations and location data...")
-                    categorized_violations, lease_info_data = self._parse_categorized_violations(response_text)
-                    
-                    # Validate response has all required fields
-                    if self._validate_categorized_response(categorized_violations, lease_info_data):
-                        logger.info(f"Successfully completed analysis with {model_name}")
-                        break  # Success - exit retry loop
-                    else:
-                        logger.warning(f"Attempt {attempt + 1}: Invalid response structure, retrying...")
-                        last_error = Exception("Invalid response structure")
-                        if attempt < max_retries - 1:
-                            continue
-                        
-                except json.JSONDecodeError as e:
-                    last_error = e
-                    logger.warning(f"Attempt {attempt + 1}: JSON parse error: {str(e)}")
-                    if attempt < max_retries - 1:
-                        continue
-                    # If all retries fail, try next model
-                except AIModelError as e:
-                    # Check if it's an access denied error
-                    if "Access denied" in str(e) or "AccessDeniedException" in str(e):
-                        logger.warning(f"Access denied to {model_name}, trying next model...")
-                        last_error = e
-                        break  # Break inner loop to try next model
-                    else:
-                        last_error = e
-                        logger.error(f"Attempt {attempt + 1}: Error: {str(e)}")
-                        if attempt < max_retries - 1:
-                            time.sleep(1)
-                            continue
-                        break
-                except Exception as e:
-                    last_error = e
-                    logger.error(f"Attempt {attempt + 1}: Error in categorized analysis: {str(e)}")
-                    if attempt < max_retries - 1:
-                        time.sleep(1)  # Brief delay before retry
-                        continue
-                    break
-            
-            # If successful, calculate metrics and exit model loop
-            if self._validate_categorized_response(categorized_violations, lease_info_data):
-                # Calculate metrics
-                elapsed_time = time.time() - start_time
-                
-                # Count total violations
-                all_violations = []
-                for violations_list in categorized_violations.values():
-                    all_violations.extend(violations_list)
-                
-                metrics = AnalysisMetrics(
-                    model_name=model_name,
-                    search_strategy=SearchStrategy.DUCKDUCKGO_SEARCH,  # Bedrock always uses DuckDuckGo
-                    total_time_seconds=elapsed_time,
-                    cost_usd=self._calculate_cost(model_name, tokens_used),
-                    gov_citations_count=sum(
-                        len([c for c in v.citations if c.is_gov_site]) 
-                        for v in all_violations
-                ),
-                total_citations_count=sum(len(v.citations) for v in all_violations),
-                violations_found=len(all_violations),
-                avg_confidence_score=sum(v.confidence_score for v in all_violations) / len(all_violations) if all_violations else 0,
-                has_law_references=any(
-                    c.law_reference for v in all_violations for c in v.citations
-                ),
-                tokens_used=tokens_used
-                )
-                
-                # Return successful result
-                return categorized_violations, metrics, lease_info_data
         
-        # If we get here, all models failed
-        if last_error:
-            logger.error(f"All retries failed. Last error: {str(last_error)}")
-            
-            # Return empty result with error metrics
-            elapsed_time = time.time() - start_time
-            metrics = AnalysisMetrics(
-                model_name=model_name,
-                search_strategy=SearchStrategy.DUCKDUCKGO_SEARCH,
-                total_time_seconds=elapsed_time,
-                cost_usd=0.0,
-                gov_citations_count=0,
-                total_citations_count=0,
-                violations_found=0,
-                avg_confidence_score=0.0,
-                has_law_references=False,
-                tokens_used={"prompt": 0, "completion": 0, "total": 0}
-            )
-            
-            return {}, metrics, None
+        try:
+            for future in as_completed(futures, timeout=_HEDGE_TIMEOUT_SECONDS):
+                result, error = future.result()
+                if result:
+                    logger.info(f"Hedged categorized analysis won by {futures[future]}")
+                    return futures[future], result, None
+                last_error = error or last_error
+        except FuturesTimeoutError as e:
+            logger.error(f"Hedged categorized analysis timed out after {_HEDGE_TIMEOUT_SECONDS}s")
+            last_error = e
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return models[-1], None, last_error
     
     def _validate_categorized_response(
         self,
@@ -794,29 +1308,29 @@ class BedrockClient:
         lease_info_data: Optional[Dict[str, str]]
     ) -> bool:
         """Validate that categorized response has all required fields and quality"""
-        required_categories = ["rent_increase", "tenant_owner_rights", "fair_housing_laws", "licensing", "others"]
-        
         # Check all categories present
-        if not all(cat in violations_by_category for cat in required_categories):
+        if _REQUIRED_CATEGORIES - violations_by_category.keys():
             logger.warning("Missing required categories")
             return False
         
-        # Validate each violation has required fields and quality
+        # Validate each violation has required fields and quality (cheapest checks first)
         for category, violations in violations_by_category.items():
             for v in violations:
-                # Check lease_clause is not empty
-                if not v.lease_clause or v.lease_clause.strip() == "":
-                    logger.warning(f"Empty lease_clause in {category}")
-                    return False
-                
                 # Check has at least one citation
-                if not v.citations or len(v.citations) == 0:
+                if not v.citations:
                     logger.warning(f"No citations in {category}")
                     return False
                 
                 # Check confidence score is reasonable
-                if v.confidence_score < 0.5 or v.confidence_score > 1.0:
-                    logger.warning(f"Invalid confidence score: {v.confidence_score}")
+                confidence = v.confidence_score
+                if not 0.5 <= confidence <= 1.0:
+                    logger.warning(f"Invalid confidence score: {confidence}")
+                    return False
+                
+                # Check lease_clause is not empty
+                clause = v.lease_clause
+                if not clause or not clause.strip():
+                    logger.warning(f"Empty lease_clause in {category}")
                     return False
         
         return True
@@ -845,25 +1359,22 @@ class BedrockClient:
                 logger.error(f"Response preview: {response_text[:500]}")
                 return violations_by_category, lease_info_data
             
-            # Sanitize JSON string to remove invalid control characters
-            json_str = self._sanitize_json_string(json_str)
-            
-            # Log sanitized JSON for debugging (show more for troubleshooting)
-            logger.info("="*80)
-            logger.info("SANITIZED JSON STRING:")
+            # Log extracted JSON for debugging (show more for troubleshooting)
+            logger.info(_BANNER)
+            logger.info("EXTRACTED JSON STRING:")
             logger.info(json_str[:1000] if len(json_str) > 1000 else json_str)
             if len(json_str) > 1000:
                 logger.info(f"... (truncated, total length: {len(json_str)} chars)")
-            logger.info("="*80)
+            logger.info(_BANNER)
             
-            data = json.loads(json_str)
+            data = self._parse_json(json_str)
             logger.info("JSON PARSED SUCCESSFULLY!")
             logger.info(f"Found {len(data.get('violations', []))} violations")
             
             # Extract lease info
             lease_info_data = data.get("lease_info", {})
             if lease_info_data:
-                logger.info("\n" + "="*80)
+                logger.info("\n" + _BANNER)
                 logger.info("AI EXTRACTED LOCATION & LEASE INFO:")
                 logger.info(f"  Location: {lease_info_data.get('city')}, {lease_info_data.get('state')} ({lease_info_data.get('county')} County)")
                 logger.info(f"  Address: {lease_info_data.get('address')}")
@@ -873,21 +1384,25 @@ class BedrockClient:
                 logger.info(f"  Deposit: {lease_info_data.get('security_deposit')}")
                 logger.info(f"  Duration: {lease_info_data.get('lease_duration')}")
                 logger.info("AI used this location to search for .gov laws")
-                logger.info("="*80 + "\n")
+                logger.info(_BANNER + "\n")
             
             # Parse violations
             for v_data in data.get("violations", []):
                 try:
+                    # Bound .get avoids re-resolving the method for every field
+                    v_get = v_data.get
+                    
                     # Parse citations
                     citations = []
-                    for c_data in v_data.get("citations", []):
+                    for c_data in v_get("citations", []):
                         try:
+                            c_get = c_data.get
                             citation = Citation(
-                                source_url=c_data.get("source_url", ""),
-                                title=c_data.get("title", ""),
-                                relevant_text=c_data.get("relevant_text", ""),
-                                law_reference=c_data.get("law_reference"),
-                                is_gov_site=c_data.get("is_gov_site", False)
+                                source_url=c_get("source_url", ""),
+                                title=c_get("title", ""),
+                                relevant_text=c_get("relevant_text", ""),
+                                law_reference=c_get("law_reference"),
+                                is_gov_site=c_get("is_gov_site", False)
                             )
                             citations.append(citation)
                         except Exception as e:
@@ -896,27 +1411,26 @@ class BedrockClient:
                             continue
                     
                     # Get category
-                    category_str = v_data.get("category", "others").lower()
-                    try:
-                        category = ViolationCategory(category_str)
-                    except ValueError:
+                    category_str = v_get("category", "others").lower()
+                    category = _VIOLATION_CATEGORIES.get(category_str)
+                    if category is None:
                         logger.warning(f"Invalid category '{category_str}', defaulting to 'others'")
                         category = ViolationCategory.OTHERS
                     
                     # Create categorized violation (handle null values gracefully)
-                    lease_clause = v_data.get("lease_clause")
-                    if lease_clause is None or lease_clause == "null":
+                    lease_clause = v_get("lease_clause")
+                    if lease_clause in _NULL_SENTINELS:
                         lease_clause = "No specific clause cited"
                     
                     violation = CategorizedViolation(
-                        violation_type=v_data.get("violation_type", "Unknown"),
+                        violation_type=v_get("violation_type", "Unknown"),
                         category=category,
-                        description=v_data.get("description", ""),
-                        severity=v_data.get("severity", "medium"),
-                        confidence_score=v_data.get("confidence_score", 0.5),
+                        description=v_get("description", ""),
+                        severity=v_get("severity", "medium"),
+                        confidence_score=v_get("confidence_score", 0.5),
                         lease_clause=lease_clause,
                         citations=citations,
-                        recommended_action=v_data.get("recommended_action") or "Review with legal counsel and amend lease accordingly"
+                        recommended_action=v_get("recommended_action") or "Review with legal counsel and amend lease accordingly"
                     )
                     
                     # Add to appropriate category
@@ -928,44 +1442,28 @@ class BedrockClient:
                     continue
         
         except json.JSONDecodeError as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"JSON DECODE ERROR: {str(e)}")
             logger.error(f"Error at position: {e.pos if hasattr(e, 'pos') else 'unknown'}")
             logger.error(f"Response text (first 500 chars): {response_text[:500]}")
-            logger.error("="*80)
+            logger.error(_BANNER)
         except Exception as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"UNEXPECTED ERROR in categorized parsing: {str(e)}")
             logger.error(f"Error type: {type(e).__name__}")
             logger.error(f"Response text (first 500 chars): {response_text[:500]}")
-            logger.error("="*80)
+            logger.error(_BANNER)
         
         return violations_by_category, lease_info_data
     
     @staticmethod
     def get_available_models() -> List[Dict[str, any]]:
         """Get list of available Bedrock models with metadata"""
-        models = []
-        
-        for model_id in settings.ALL_MODELS:
-            pricing = BedrockClient.MODEL_PRICING.get(
-                model_id,
-                {"input": 0, "output": 0}
-            )
-            
-            # Extract provider from model ID (e.g., "anthropic" from "anthropic.claude...")
-            provider = model_id.split(".")[0]
-            
-            models.append({
-                "model_id": model_id,
-                "name": model_id.split(".")[-1],  # Get model name after last dot
-                "provider": provider,
-                "has_native_search": False,  # Bedrock has no native search
-                "estimated_cost_per_1k_tokens": pricing,
-                "context_length": 200000 if "claude-3" in model_id else 128000  # Claude has 200k context
-            })
-        
-        return models
+        # Copies, so callers cannot mutate the cached entries or MODEL_PRICING through them
+        return [
+            dict(model, estimated_cost_per_1k_tokens=dict(model["estimated_cost_per_1k_tokens"]))
+            for model in _available_models()
+        ]
     
     def evaluate_maintenance_request(
         self,
@@ -988,23 +1486,27 @@ class BedrockClient:
         
         try:
             # Build maintenance evaluation prompt
+            from app.prompts.maintenance_prompts import (
+                build_maintenance_evaluation_prompt,
+                MAINTENANCE_EVALUATION_SYSTEM_PROMPT
+            )
             prompt = build_maintenance_evaluation_prompt(maintenance_request, lease_info, landlord_notes)
             
             # Format request for Bedrock
             body = self._format_messages_for_bedrock(
                 model_id=model_name,
-                system_prompt="You are a landlord reviewing a maintenance request. Evaluate it against the lease agreement and decide whether to approve or reject it based ONLY on what the lease says. Be fair and follow the lease terms exactly.",
+                system_prompt=MAINTENANCE_EVALUATION_SYSTEM_PROMPT,
                 user_prompt=prompt
             )
             
             # Make API call
-            response_text, _ = self._call_bedrock_with_retry(model_name, body)
+            response_text, _ = self._invoke_bedrock(model_name, body)
             
-            # LOG THE FULL RESPONSE
-            logger.info("="*80)
-            logger.info("FULL AI RESPONSE FOR MAINTENANCE EVALUATION:")
-            logger.info(response_text)
-            logger.info("="*80)
+            logger.info("AI response for maintenance evaluation: %d characters, starts: %s", len(response_text), response_text[:256])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_BANNER)
+                logger.debug("FULL AI RESPONSE FOR MAINTENANCE EVALUATION: %s", response_text)
+                logger.debug(_BANNER)
             
             # Parse evaluation response
             evaluation_data = self._parse_maintenance_response(response_text, maintenance_request)
@@ -1031,60 +1533,31 @@ class BedrockClient:
         """Parse maintenance evaluation response from model"""
         
         try:
-            logger.info("="*80)
-            logger.info("PARSING MAINTENANCE RESPONSE")
-            logger.info(f"Response length: {len(response_text)} characters")
-            logger.info("="*80)
-            
-            # Try multiple extraction methods
-            json_str = None
-            
-            # Method 1: Look for ```json code blocks
-            if "```json" in response_text:
-                logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
-                    logger.info("Extracted from ```json block")
-            
-            # Method 2: Look for plain ``` code blocks
-            elif "```" in response_text and json_str is None:
-                logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
-                    logger.info("Extracted from ``` block")
-            
-            # Method 3: Find { to } brackets
-            if json_str is None:
-                logger.info("No code blocks found, looking for JSON brackets...")
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                
-                if json_start != -1 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                    logger.info(f"Found JSON from position {json_start} to {json_end}")
-                else:
-                    logger.error("No JSON brackets found in response")
-                    logger.error(f"Full response: {response_text}")
-                    return MaintenanceResponse(
-                        maintenance_request=original_request,
-                        decision="approved",
-                        response_message="We will review your maintenance request and respond shortly.",
-                        decision_reasons=["Unable to parse lease evaluation"],
-                        lease_clauses_cited=[]
-                    )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(_BANNER)
+                logger.info("PARSING MAINTENANCE RESPONSE")
+                logger.info("Response length: %d characters", len(response_text))
+                logger.info(_BANNER)
             
-            # Sanitize JSON string to remove invalid control characters
-            json_str = self._sanitize_json_string(json_str)
+            # Extract JSON from a code block, or the outermost braces if there is none
+            json_str = self._extract_json_from_markdown(response_text)
+            if json_str is None:
+                logger.error(f"Full response: {response_text}")
+                return MaintenanceResponse(
+                    maintenance_request=original_request,
+                    decision="approved",
+                    response_message="We will review your maintenance request and respond shortly.",
+                    decision_reasons=["Unable to parse lease evaluation"],
+                    lease_clauses_cited=[]
+                )
             
             # Log what we're about to parse
-            logger.info("SANITIZED JSON STRING TO PARSE:")
-            logger.info(json_str)
-            logger.info("="*80)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("JSON STRING TO PARSE: %s", json_str)
+                logger.debug(_BANNER)
             
             # Parse the JSON
-            data = json.loads(json_str)
+            data = self._parse_json(json_str)
             logger.info("JSON PARSED SUCCESSFULLY!")
             logger.info(f"Keys found: {list(data.keys())}")
             logger.info(f"Decision: {data.get('decision', 'unknown')}")
@@ -1102,12 +1575,12 @@ class BedrockClient:
             )
         
         except json.JSONDecodeError as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"JSON DECODE ERROR: {str(e)}")
             logger.error(f"Error at position: {e.pos if hasattr(e, 'pos') else 'unknown'}")
             logger.error(f"JSON string that failed:")
             logger.error(json_str if json_str else "N/A")
-            logger.error("="*80)
+            logger.error(_BANNER)
             return MaintenanceResponse(
                 maintenance_request=original_request,
                 decision="approved",
@@ -1116,11 +1589,11 @@ class BedrockClient:
                 lease_clauses_cited=[]
             )
         except Exception as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"UNEXPECTED ERROR: {str(e)}")
             logger.error(f"Error type: {type(e).__name__}")
             logger.error(f"Response text (first 500 chars): {response_text[:500]}")
-            logger.error("="*80)
+            logger.error(_BANNER)
             return MaintenanceResponse(
                 maintenance_request=original_request,
                 decision="approved",
@@ -1150,23 +1623,27 @@ class BedrockClient:
         
         try:
             # Build vendor work order prompt
+            from app.prompts.maintenance_prompts import (
+                build_vendor_work_order_prompt,
+                VENDOR_WORK_ORDER_SYSTEM_PROMPT
+            )
             prompt = build_vendor_work_order_prompt(maintenance_request, lease_info, landlord_notes)
             
             # Format request for Bedrock
             body = self._format_messages_for_bedrock(
                 model_id=model_name,
-                system_prompt="You are a property management assistant creating professional work orders for vendors. Generate clear, detailed work orders that help vendors understand exactly what needs to be fixed.",
+                system_prompt=VENDOR_WORK_ORDER_SYSTEM_PROMPT,
                 user_prompt=prompt
             )
             
             # Make API call
-            response_text, _ = self._call_bedrock_with_retry(model_name, body)
+            response_text, _ = self._invoke_bedrock(model_name, body)
             
-            # LOG THE FULL RESPONSE
-            logger.info("="*80)
-            logger.info("FULL AI RESPONSE FOR VENDOR WORK ORDER:")
-            logger.info(response_text)
-            logger.info("="*80)
+            logger.info("AI response for vendor work order: %d characters, starts: %s", len(response_text), response_text[:256])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_BANNER)
+                logger.debug("FULL AI RESPONSE FOR VENDOR WORK ORDER: %s", response_text)
+                logger.debug(_BANNER)
             
             # Parse work order response
             work_order_data = self._parse_vendor_response(response_text, maintenance_request)
@@ -1194,59 +1671,30 @@ class BedrockClient:
         """Parse vendor work order response from model"""
         
         try:
-            logger.info("="*80)
-            logger.info("PARSING VENDOR WORK ORDER RESPONSE")
-            logger.info(f"Response length: {len(response_text)} characters")
-            logger.info("="*80)
-            
-            # Try multiple extraction methods
-            json_str = None
-            
-            # Method 1: Look for ```json code blocks
-            if "```json" in response_text:
-                logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
-                    logger.info("Extracted from ```json block")
-            
-            # Method 2: Look for plain ``` code blocks
-            elif "```" in response_text and json_str is None:
-                logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
-                    logger.info("Extracted from ``` block")
-            
-            # Method 3: Find { to } brackets
-            if json_str is None:
-                logger.info("No code blocks found, looking for JSON brackets...")
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                
-                if json_start != -1 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                    logger.info(f"Found JSON from position {json_start} to {json_end}")
-                else:
-                    logger.error("No JSON brackets found in response")
-                    logger.error(f"Full response: {response_text}")
-                    return VendorWorkOrder(
-                        maintenance_request=original_request,
-                        work_order_title="Maintenance Request",
-                        comprehensive_description=f"Please address: {original_request}. Property details in lease.",
-                        urgency_level="routine"
-                    )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(_BANNER)
+                logger.info("PARSING VENDOR WORK ORDER RESPONSE")
+                logger.info("Response length: %d characters", len(response_text))
+                logger.info(_BANNER)
             
-            # Sanitize JSON string to remove invalid control characters
-            json_str = self._sanitize_json_string(json_str)
+            # Extract JSON from a code block, or the outermost braces if there is none
+            json_str = self._extract_json_from_markdown(response_text)
+            if json_str is None:
+                logger.error(f"Full response: {response_text}")
+                return VendorWorkOrder(
+                    maintenance_request=original_request,
+                    work_order_title="Maintenance Request",
+                    comprehensive_description=f"Please address: {original_request}. Property details in lease.",
+                    urgency_level="routine"
+                )
             
             # Log what we're about to parse
-            logger.info("SANITIZED JSON STRING TO PARSE:")
-            logger.info(json_str)
-            logger.info("="*80)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("JSON STRING TO PARSE: %s", json_str)
+                logger.debug(_BANNER)
             
             # Parse the JSON
-            data = json.loads(json_str)
+            data = self._parse_json(json_str)
             logger.info("JSON PARSED SUCCESSFULLY!")
             logger.info(f"Keys found: {list(data.keys())}")
             logger.info(f"Work order title: {data.get('work_order_title', 'unknown')}")
@@ -1259,12 +1707,12 @@ class BedrockClient:
             )
         
         except json.JSONDecodeError as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"JSON DECODE ERROR: {str(e)}")
             logger.error(f"Error at position: {e.pos if hasattr(e, 'pos') else 'unknown'}")
             logger.error(f"JSON string that failed:")
             logger.error(json_str if json_str else "N/A")
-            logger.error("="*80)
+            logger.error(_BANNER)
             return VendorWorkOrder(
                 maintenance_request=original_request,
                 work_order_title="Maintenance Request",
@@ -1272,11 +1720,11 @@ class BedrockClient:
                 urgency_level="routine"
             )
         except Exception as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"UNEXPECTED ERROR: {str(e)}")
             logger.error(f"Error type: {type(e).__name__}")
             logger.error(f"Response text (first 500 chars): {response_text[:500]}")
-            logger.error("="*80)
+            logger.error(_BANNER)
             return VendorWorkOrder(
                 maintenance_request=original_request,
                 work_order_title="Maintenance Request",
@@ -1295,18 +1743,23 @@ class BedrockClient:
         model_name = settings.FREE_MODEL
         
         try:
+            from app.prompts.maintenance_prompts import (
+                build_maintenance_workflow_prompt,
+                MAINTENANCE_WORKFLOW_SYSTEM_PROMPT
+            )
             prompt = build_maintenance_workflow_prompt(maintenance_request, lease_info, landlord_notes)
             body = self._format_messages_for_bedrock(
                 model_id=model_name,
-                system_prompt="You are a property management assistant. Evaluate maintenance requests against lease agreements, generate professional messages for tenants, and create detailed work orders for vendors. Be fair, professional, and thorough.",
+                system_prompt=MAINTENANCE_WORKFLOW_SYSTEM_PROMPT,
                 user_prompt=prompt
             )
             
-            response_text, _ = self._call_bedrock_with_retry(model_name, body)
-            logger.info("="*80)
-            logger.info("FULL AI RESPONSE FOR MAINTENANCE WORKFLOW:")
-            logger.info(response_text)
-            logger.info("="*80)
+            response_text, _ = self._invoke_bedrock(model_name, body)
+            logger.info("AI response for maintenance workflow: %d characters, starts: %s", len(response_text), response_text[:256])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_BANNER)
+                logger.debug("FULL AI RESPONSE FOR MAINTENANCE WORKFLOW: %s", response_text)
+                logger.debug(_BANNER)
             
             workflow_data = self._parse_workflow_response(response_text, maintenance_request)
             return workflow_data
@@ -1330,47 +1783,29 @@ class BedrockClient:
     def _parse_workflow_response(self, response_text: str, original_request: str) -> MaintenanceWorkflow:
         """Parse maintenance workflow response from model"""
         try:
-            logger.info("="*80)
-            logger.info("PARSING MAINTENANCE WORKFLOW RESPONSE")
-            logger.info(f"Response length: {len(response_text)} characters")
-            logger.info("="*80)
-            
-            json_str = None
-            if "```json" in response_text:
-                logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
-            elif "```" in response_text and json_str is None:
-                logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(_BANNER)
+                logger.info("PARSING MAINTENANCE WORKFLOW RESPONSE")
+                logger.info("Response length: %d characters", len(response_text))
+                logger.info(_BANNER)
             
+            json_str = self._extract_json_from_markdown(response_text)
             if json_str is None:
-                logger.info("No code blocks found, looking for JSON brackets...")
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                else:
-                    logger.error("No JSON brackets found in response")
-                    return MaintenanceWorkflow(
-                        maintenance_request=original_request,
-                        tenant_message="We have received your maintenance request and will respond shortly.",
-                        tenant_message_tone="neutral",
-                        decision="approved",
-                        decision_reasons=["Unable to parse evaluation"],
-                        lease_clauses_cited=[],
-                        vendor_work_order=None
-                    )
+                return MaintenanceWorkflow(
+                    maintenance_request=original_request,
+                    tenant_message="We have received your maintenance request and will respond shortly.",
+                    tenant_message_tone="neutral",
+                    decision="approved",
+                    decision_reasons=["Unable to parse evaluation"],
+                    lease_clauses_cited=[],
+                    vendor_work_order=None
+                )
             
-            json_str = self._sanitize_json_string(json_str)
-            logger.info("SANITIZED JSON STRING TO PARSE:")
-            logger.info(json_str)
-            logger.info("="*80)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("JSON STRING TO PARSE: %s", json_str)
+                logger.debug(_BANNER)
             
-            data = json.loads(json_str)
+            data = self._parse_json(json_str)
             logger.info("JSON PARSED SUCCESSFULLY!")
             logger.info(f"Keys found: {list(data.keys())}")
             logger.info(f"Decision: {data.get('decision', 'unknown')}")
@@ -1397,10 +1832,10 @@ class BedrockClient:
                 alternative_action=data.get("alternative_action")
             )
         except json.JSONDecodeError as e:
-            logger.error("="*80)
+            logger.error(_BANNER)
             logger.error(f"JSON DECODE ERROR: {str(e)}")
             logger.error(f"JSON string that failed: {json_str if 'json_str' in locals() else 'N/A'}")
-            logger.error("="*80)
+            logger.error(_BANNER)
             return MaintenanceWorkflow(
                 maintenance_request=original_request,
                 tenant_message="We will review your maintenance request and respond shortly.",
@@ -1427,6 +1862,7 @@ class BedrockClient:
         model_name = settings.FREE_MODEL
         
         try:
+            from app.prompts.tenant_communication_prompts import build_tenant_message_rewrite_prompt
             prompt = build_tenant_message_rewrite_prompt(tenant_message)
             body = self._format_messages_for_bedrock(
                 model_id=model_name,
@@ -1434,11 +1870,11 @@ class BedrockClient:
                 user_prompt=prompt
             )
             
-            response_text, _ = self._call_bedrock_with_retry(model_name, body)
-            logger.info("="*80)
-            logger.info("FULL AI RESPONSE FOR TENANT MESSAGE REWRITE:")
-            logger.info(response_text)
-            logger.info("="*80)
+            response_text, _ = self._invoke_bedrock(model_name, body)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_BANNER)
+                logger.debug("FULL AI RESPONSE FOR TENANT MESSAGE REWRITE: %s", response_text)
+                logger.debug(_BANNER)
             
             rewrite_data = self._parse_tenant_rewrite_response(response_text, tenant_message)
             return rewrite_data
@@ -1455,42 +1891,44 @@ class BedrockClient:
     
 
     
-    def _parse_tenant_rewrite_response(self, response_text: str, original_message: str) -> TenantMessageRewrite:
-        """Parse tenant message rewrite response from model"""
+    def _parse_llm_json(self, response_text: str, label: str, build, fallback):
+        """
+        Shared parse path for responses that carry a single JSON object
+        
+        Args:
+            response_text: Raw model output
+            label: Name shown in the log banner (e.g. "MOVE-OUT")
+            build: Callable turning the parsed JSON object into the response model
+            fallback: Callable(stage, error) returning the default response; stage is
+                "missing" (no JSON object found), "decode" (invalid JSON) or "error"
+            
+        Returns:
+            Whatever build or fallback returns
+        """
         try:
-            logger.info("="*80)
-            logger.info("PARSING TENANT MESSAGE REWRITE RESPONSE")
-            logger.info(f"Response length: {len(response_text)} characters")
-            logger.info("="*80)
-            
-            json_str = None
-            if "```json" in response_text:
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
-            elif "```" in response_text and json_str is None:
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(_BANNER)
+                logger.info("PARSING %s RESPONSE", label)
+                logger.info("Response length: %d characters", len(response_text))
+                logger.info(_BANNER)
             
+            json_str = self._extract_json_from_markdown(response_text)
             if json_str is None:
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                else:
-                    return TenantMessageRewrite(
-                        original_message=original_message,
-                        rewritten_message=original_message,
-                        improvements_made=["Unable to parse AI response"],
-                        tone="original",
-                        estimated_urgency="routine"
-                    )
+                return fallback("missing", None)
             
-            json_str = self._sanitize_json_string(json_str)
-            data = json.loads(json_str)
+            data = self._parse_json(json_str)
             logger.info("JSON PARSED SUCCESSFULLY!")
-            
+            return build(data)
+        except json.JSONDecodeError as e:
+            logger.error("JSON DECODE ERROR: %s", e)
+            return fallback("decode", e)
+        except Exception as e:
+            logger.error("UNEXPECTED ERROR: %s", e)
+            return fallback("error", e)
+    
+    def _parse_tenant_rewrite_response(self, response_text: str, original_message: str) -> TenantMessageRewrite:
+        """Parse tenant message rewrite response from model"""
+        def build(data: Dict) -> TenantMessageRewrite:
             return TenantMessageRewrite(
                 original_message=original_message,
                 rewritten_message=data.get("rewritten_message", original_message),
@@ -1498,42 +1936,38 @@ class BedrockClient:
                 tone=data.get("tone", "professional"),
                 estimated_urgency=data.get("estimated_urgency", "routine")
             )
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON DECODE ERROR: {str(e)}")
-            return TenantMessageRewrite(
-                original_message=original_message,
-                rewritten_message=original_message,
-                improvements_made=["JSON parsing error - using original"],
-                tone="original",
-                estimated_urgency="routine"
-            )
-        except Exception as e:
-            logger.error(f"UNEXPECTED ERROR: {str(e)}")
+        
+        def fallback(stage: str, error: Optional[Exception]) -> TenantMessageRewrite:
+            if stage == "missing":
+                note = "Unable to parse AI response"
+            elif stage == "decode":
+                note = "JSON parsing error - using original"
+            else:
+                note = f"Error: {type(error).__name__}"
             return TenantMessageRewrite(
                 original_message=original_message,
                 rewritten_message=original_message,
-                improvements_made=[f"Error: {type(e).__name__}"],
+                improvements_made=[note],
                 tone="original",
                 estimated_urgency="routine"
             )
+        
+        return self._parse_llm_json(response_text, "TENANT MESSAGE REWRITE", build, fallback)
     
     def evaluate_move_out_request(self, move_out_request: str, lease_info: LeaseInfo, owner_notes: Optional[str] = None) -> MoveOutResponse:
         """Evaluate tenant move-out request against lease terms"""
-        model_name = settings.FREE_MODEL
-        
         try:
+            from app.prompts.tenant_communication_prompts import build_move_out_evaluation_prompt
             prompt = build_move_out_evaluation_prompt(move_out_request, lease_info, owner_notes)
-            body = self._format_messages_for_bedrock(
-                model_id=model_name,
-                system_prompt="You are a property owner evaluating a tenant's move-out request. Check if they provided proper notice according to the lease, calculate any financial obligations, and provide clear next steps.",
-                user_prompt=prompt
-            )
+            system_prompt = "You are a property owner evaluating a tenant's move-out request. Check if they provided proper notice according to the lease, calculate any financial obligations, and provide clear next steps."
             
-            response_text, _ = self._call_bedrock_with_retry(model_name, body)
-            logger.info("="*80)
-            logger.info("FULL AI RESPONSE FOR MOVE-OUT EVALUATION:")
-            logger.info(response_text)
-            logger.info("="*80)
+            response_text, _ = self._call_with_fallback(
+                lambda model_id: self._format_messages_for_bedrock(model_id, system_prompt, prompt)
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_BANNER)
+                logger.debug("FULL AI RESPONSE FOR MOVE-OUT EVALUATION: %s", response_text)
+                logger.debug(_BANNER)
             
             evaluation_data = self._parse_move_out_response(response_text, move_out_request)
             return evaluation_data
@@ -1557,45 +1991,8 @@ class BedrockClient:
     
     def _parse_move_out_response(self, response_text: str, original_request: str) -> MoveOutResponse:
         """Parse move-out evaluation response from model"""
-        try:
-            logger.info("="*80)
-            logger.info("PARSING MOVE-OUT RESPONSE")
-            logger.info(f"Response length: {len(response_text)} characters")
-            logger.info("="*80)
-            
-            json_str = None
-            if "```json" in response_text:
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
-            elif "```" in response_text and json_str is None:
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
-            
-            if json_str is None:
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                else:
-                    return MoveOutResponse(
-                        move_out_request=original_request,
-                        decision="requires_attention",
-                        response_message="We received your move-out request and will review it shortly.",
-                        notice_period_valid=False,
-                        notice_period_required="Unable to determine",
-                        notice_period_given="Unable to determine",
-                        move_out_date="Unknown",
-                        financial_summary={"rent_owed": "Unable to calculate", "security_deposit": "Will be reviewed", "other_fees": "None specified"},
-                        lease_clauses_cited=[],
-                        next_steps=["We will evaluate your request and respond within 2 business days"]
-                    )
-            
-            json_str = self._sanitize_json_string(json_str)
-            data = json.loads(json_str)
-            logger.info("JSON PARSED SUCCESSFULLY!")
-            logger.info(f"Notice valid: {data.get('notice_period_valid', 'unknown')}")
+        def build(data: Dict) -> MoveOutResponse:
+            logger.info("Notice valid: %s", data.get('notice_period_valid', 'unknown'))
             
             financial_summary = {
                 "rent_owed": data.get("rent_owed", "To be calculated"),
@@ -1620,33 +2017,112 @@ class BedrockClient:
                 next_steps=data.get("next_steps", ["We will respond within 2 business days"]),
                 estimated_refund_timeline=None
             )
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON DECODE ERROR: {str(e)}")
+        
+        def fallback(stage: str, error: Optional[Exception]) -> MoveOutResponse:
+            if stage == "missing":
+                required, given = "Unable to determine", "Unable to determine"
+                next_step = "We will evaluate your request and respond within 2 business days"
+            elif stage == "decode":
+                required, given = "Unknown - Error parsing", "Unknown"
+                next_step = "Error parsing lease - will respond manually within 2 business days"
+            else:
+                required, given = "Unknown - Error occurred", "Unknown"
+                next_step = "Error processing request - will respond manually within 2 business days"
             return MoveOutResponse(
                 move_out_request=original_request,
                 decision="requires_attention",
                 response_message="We received your move-out request and will review it shortly.",
                 notice_period_valid=False,
-                notice_period_required="Unknown - Error parsing",
-                notice_period_given="Unknown",
+                notice_period_required=required,
+                notice_period_given=given,
                 move_out_date="Unknown",
                 financial_summary={"rent_owed": "Unable to calculate", "security_deposit": "Will be reviewed", "other_fees": "None specified"},
                 lease_clauses_cited=[],
-                next_steps=["Error parsing lease - will respond manually within 2 business days"]
+                next_steps=[next_step]
             )
-        except Exception as e:
-            logger.error(f"UNEXPECTED ERROR: {str(e)}")
-            return MoveOutResponse(
-                move_out_request=original_request,
-                decision="requires_attention",
-                response_message="We received your move-out request and will review it shortly.",
-                notice_period_valid=False,
-                notice_period_required="Unknown - Error occurred",
-                notice_period_given="Unknown",
-                move_out_date="Unknown",
-                financial_summary={"rent_owed": "Unable to calculate", "security_deposit": "Will be reviewed", "other_fees": "None specified"},
-                lease_clauses_cited=[],
-                next_steps=[f"Error processing request - will respond manually within 2 business days"]
+        
+        return self._parse_llm_json(response_text, "MOVE-OUT", build, fallback)
+
+    def _chat_emergency_response(self, conversation_history: List[ChatMessage]) -> Optional[MaintenanceChatResponse]:
+        """Canned safety response when the latest user message names an emergency, else None"""
+        user_message = conversation_history[-1].content.lower()
+        matches = _EMERGENCY_PATTERN.findall(user_message)
+        if not matches:
+            return None
+        
+        emergency_category = _EMERGENCY_KEYWORDS[min(matches, key=_EMERGENCY_PRIORITY.__getitem__)]
+        logger.warning(f"Emergency keyword ({emergency_category}) detected in maintenance chat: {user_message[:100]}")
+        return _EMERGENCY_POLICIES[emergency_category]
+    
+    def _chat_request_body(self, recent_history: List[ChatMessage], user_turns: int) -> Dict:
+        """Anthropic Messages body for a maintenance chat turn"""
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": _CHAT_MAX_TOKENS_SHORT if user_turns < _CHAT_DEEP_CONVERSATION_TURNS else _CHAT_MAX_TOKENS_LONG,
+            "temperature": 0.3,
+            "system": _anthropic_system(_CHAT_SYSTEM_PROMPT),
+            "messages": [{"role": msg.role, "content": msg.content} for msg in recent_history]
+        }
+    
+    def _parse_chat_response(self, response_text: str) -> MaintenanceChatResponse:
+        """Parse the chat model's JSON reply, falling back to the raw text when it is not JSON"""
+        try:
+            # Extract JSON from markdown if present
+            json_str = self._extract_json_from_markdown(response_text)
+            if not json_str:
+                json_str = response_text.strip()
+            
+            try:
+                parsed = orjson.loads(json_str)
+            except orjson.JSONDecodeError as e:
+                # Raw control characters are the usual culprit: drop the ones JSON never
+                # allows, escape newlines/tabs inside string values, then parse once more
+                logger.debug("Direct parse failed (%s), repairing control characters", e)
+                parsed = orjson.loads(_JSON_STRING_LITERAL.sub(
+                    lambda literal: literal.group().translate(_STRING_CTRL_ESCAPES),
+                    json_str.translate(BAD_CTRL)
+                ))
+            
+            # Valid JSON of the wrong shape (a list, a bare string, a null response) is
+            # handled like unparseable text
+            if not isinstance(parsed, dict):
+                raise ValueError(f"Expected a JSON object, got {type(parsed).__name__}")
+            response_value = parsed.get("response", "")
+            if not isinstance(response_value, str):
+                raise ValueError(f"Expected a string response, got {type(response_value).__name__}")
+            suggest_ticket = parsed.get("suggestTicket", False)
+            
+            # Safety net for double-encoding (the prompt forbids it, so this rarely runs):
+            # the check is one startswith on the reply, the reparse only happens on a hit
+            if response_value.strip().startswith("{"):
+                logger.warning("⚠️ Detected double-encoded JSON in response field")
+                try:
+                    # Parse inner JSON
+                    inner = orjson.loads(response_value)
+                    if isinstance(inner, dict) and "response" in inner:
+                        # Extract the actual values from inner JSON
+                        response_value = inner.get("response", response_value)
+                        suggest_ticket = inner.get("suggestTicket", suggest_ticket)
+                        logger.info("✅ Successfully fixed double-encoded JSON")
+                except json.JSONDecodeError:
+                    # If can't parse, treat the whole thing as plain text (keep as-is)
+                    logger.debug("Could not parse inner JSON, keeping original value")
+            
+            return MaintenanceChatResponse(
+                response=response_value,
+                suggestTicket=suggest_ticket
+            )
+            
+        except ValueError as e:
+            # JSONDecodeError and pydantic's ValidationError are both ValueErrors
+            logger.error(f"❌ Chat reply is not a usable JSON object: {e}")
+            logger.debug("Failed to parse: %s", response_text[:500])
+            # Fallback: use raw response
+            suggest_ticket = _SUGGEST_TICKET_PATTERN.search(response_text) is not None
+            
+            return MaintenanceChatResponse(
+                response=response_text,
+                suggestTicket=suggest_ticket
             )
     
     def maintenance_chat(self, conversation_history: List[ChatMessage]) -> MaintenanceChatResponse:
@@ -1657,132 +2133,113 @@ class BedrockClient:
             if not conversation_history or conversation_history[-1].role != "user":
                 raise ValueError("Last message in conversation history must be from user")
             
-            user_message = conversation_history[-1].content.lower()
-            emergency_keywords = [
-                "smell gas", "gas leak", "rotten egg smell", "gas smell",
-                "smell smoke", "see smoke", "sparks", "burning smell", "smoke detector",
-                "fire alarm", "co detector", "carbon monoxide",
-                "flooding", "water pouring", "ceiling bulging", "ceiling sagging",
-                "exposed wire", "outlet hot", "outlet burning", "outlet spark",
-                "no heat", "no ac", "locked out", "can't close door", "door won't lock",
-                "front door", "exterior door", "window broken", "window won't close"
-            ]
-            
-            has_emergency = any(keyword in user_message for keyword in emergency_keywords)
-            
-            if has_emergency:
-                logger.warning(f"Emergency keyword detected in maintenance chat: {user_message[:100]}")
-                return MaintenanceChatResponse(
-                    response="This could be an emergency. If you smell gas, see or smell smoke, see sparks, or feel unsafe, please call 911 or your local emergency number immediately. After that, please contact your property's emergency maintenance line. I can help you submit an urgent maintenance request.",
-                    suggestTicket=True
-                )
+            emergency_response = self._chat_emergency_response(conversation_history)
+            if emergency_response is not None:
+                return emergency_response
             
             # Use Claude Haiku (fast, cost-effective, consistent with other APIs)
             model = settings.FREE_MODEL
             
-            # Format messages for Anthropic API
-            messages = [{"role": msg.role, "content": msg.content} for msg in conversation_history]
-            
-            # Create system prompt for JSON response
-            system_prompt = """You are a maintenance assistant. Help tenants troubleshoot issues.
-
-RESPONSE FORMAT (IMPORTANT):
-Return JSON: {"response": "your message", "suggestTicket": false}
-
-STRICT RULES:
-- ONLY discuss maintenance/property issues
-- If asked non-maintenance questions, say: "I'm here to help with maintenance issues only. Do you have a maintenance problem?"
-- "response" is plain text (your message)
-- "suggestTicket" is true when professional help needed
-- Keep responses short (2-3 sentences)
-- Ask questions to understand the issue
-- Suggest only safe solutions
-- Set suggestTicket=true after 3-4 exchanges without resolution
-- NEVER say "I'll create/submit a ticket" or "I can help submit"
-- ONLY say: "Click the red button to submit your maintenance request"
-- When ready, say EXACTLY: "Click the red button to submit your maintenance request" """
-            
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 512,
-                "temperature": 0.3,
-                "system": system_prompt,
-                "messages": messages
-            }
-            
-            response_text, _ = self._call_bedrock_with_retry(model, body)
+            recent_history = _windowed_history(conversation_history)
+            user_turns = sum(1 for msg in conversation_history if msg.role == "user")
+            body = self._chat_request_body(recent_history, user_turns)
+            
+            def body_for_model(model_id: str) -> Dict:
+                if provider_for(model_id) == "anthropic":
+                    return body
+                # Non-Claude fallbacks take a single prompt, so flatten the conversation; the
+                # shared formatters carry the lease-analysis budget, so apply the chat's instead
+                fallback_body = self._format_messages_for_bedrock(model_id, _CHAT_SYSTEM_PROMPT, _chat_transcript(recent_history))
+                fallback_body["max_gen_len" if "max_gen_len" in fallback_body else "max_tokens"] = body["max_tokens"]
+                fallback_body["temperature"] = body["temperature"]
+                return fallback_body
+            
+            response_text, _ = self._call_with_fallback(body_for_model, [model, *settings.FALLBACK_MODELS])
             elapsed_time = time.time() - start_time
             
             logger.info(f"Maintenance chat response received in {elapsed_time:.2f}s")
-            logger.debug(f"Raw AI response (first 300 chars): {response_text[:300]}")
+            logger.debug("Raw AI response (first 300 chars): %s", response_text[:300])
             
-            try:
-                # Extract JSON from markdown if present
-                json_str = self._extract_json_from_markdown(response_text)
-                if not json_str:
-                    json_str = response_text.strip()
-                
-                # First attempt: parse directly
-                try:
-                    parsed = json.loads(json_str)
-                    logger.debug("✓ Direct JSON parse successful")
-                except json.JSONDecodeError as e1:
-                    # Second attempt: sanitize and retry
-                    logger.debug(f"Direct parse failed ({e1}), trying sanitized version...")
-                    json_str_sanitized = self._sanitize_json_string(json_str)
-                    try:
-                        parsed = json.loads(json_str_sanitized)
-                        logger.debug("✓ Sanitized JSON parse successful")
-                    except json.JSONDecodeError as e2:
-                        # Third attempt: Try to fix common issues manually
-                        logger.debug(f"Sanitized parse also failed ({e2}), manual fix attempt...")
-                        # Replace actual newlines and tabs in string values with escape sequences
-                        json_str_fixed = json_str.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                        parsed = json.loads(json_str_fixed)
-                        logger.debug("✓ Manual fix successful")
-                
-                # Get values from parsed JSON
-                response_value = parsed.get("response", "")
-                suggest_ticket = parsed.get("suggestTicket", False)
-                
-                # Fix double-encoding: check if response is a JSON string instead of plain text
-                if isinstance(response_value, str) and response_value.strip().startswith("{"):
-                    logger.warning("⚠️ Detected double-encoded JSON in response field")
-                    try:
-                        # Parse inner JSON
-                        inner = json.loads(response_value)
-                        if isinstance(inner, dict) and "response" in inner:
-                            # Extract the actual values from inner JSON
-                            response_value = inner.get("response", response_value)
-                            suggest_ticket = inner.get("suggestTicket", suggest_ticket)
-                            logger.info("✅ Successfully fixed double-encoded JSON")
-                    except json.JSONDecodeError:
-                        # If can't parse, treat the whole thing as plain text (keep as-is)
-                        logger.debug("Could not parse inner JSON, keeping original value")
-                
-                return MaintenanceChatResponse(
-                    response=response_value,
-                    suggestTicket=suggest_ticket
-                )
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ All JSON parse attempts failed: {e}")
-                logger.debug(f"Failed to parse: {response_text[:500]}")
-                # Fallback: use raw response
-                suggest_ticket = any(phrase in response_text.lower() for phrase in [
-                    "create a maintenance ticket", "create a ticket", "professional attention",
-                    "needs a professional", "call maintenance"
-                ])
-                
-                return MaintenanceChatResponse(
-                    response=response_text,
-                    suggestTicket=suggest_ticket
-                )
+            return self._parse_chat_response(response_text)
         
         except Exception as e:
             logger.error(f"Error in maintenance chat: {str(e)}")
             raise AIModelError(message="Failed to process chat message", details=str(e))
     
+    def maintenance_chat_stream(self, conversation_history: List[ChatMessage]) -> Iterator[bytes]:
+        """
+        Streamed variant of maintenance_chat, emitted as newline-delimited JSON
+        
+        Text of the reply's "response" field is yielded as {"delta": "..."} lines while
+        the model generates it, followed by one final line holding the complete
+        MaintenanceChatResponse. If streaming fails before any text was sent, the
+        non-streaming maintenance_chat (with its model fallback chain) answers instead.
+        The response status is already sent by then, so a failure ends the stream with
+        an AIModelError payload line ({"error": ..., "message": ...}) instead of raising.
+        
+        Args:
+            conversation_history: Complete chat conversation, ending with the user's message
+            
+        Yields:
+            NDJSON lines as bytes
+        """
+        if not conversation_history or conversation_history[-1].role != "user":
+            raise ValueError("Last message in conversation history must be from user")
+        
+        emergency_response = self._chat_emergency_response(conversation_history)
+        if emergency_response is not None:
+            yield orjson.dumps(emergency_response.model_dump()) + b"\n"
+            return
+        
+        model = settings.FREE_MODEL
+        user_turns = sum(1 for msg in conversation_history if msg.role == "user")
+        body = self._chat_request_body(_windowed_history(conversation_history), user_turns)
+        extract_delta = STREAM_DELTA_EXTRACTORS[provider_for(model)]
+        field_streamer = _JsonStringFieldStreamer("response")
+        parts = []
+        
+        try:
+            response = self.client.invoke_model_with_response_stream(
+                modelId=model,
+                body=orjson.dumps(body)
+            )
+            stream = response['body']
+            try:
+                for event in stream:
+                    chunk_bytes = event.get('chunk', {}).get('bytes')
+                    if not chunk_bytes:
+                        continue
+                    text = extract_delta(orjson.loads(chunk_bytes))
+                    if text:
+                        parts.append(text)
+                        delta = field_streamer.feed(text)
+                        if delta:
+                            yield orjson.dumps({"delta": delta}) + b"\n"
+            finally:
+                stream.close()
+        except Exception as e:
+            if field_streamer.emitted:
+                logger.error(f"Maintenance chat stream interrupted: {str(e)}")
+                error = AIModelError(message="Failed to process chat message", details=str(e))
+                yield error.to_json() + b"\n"
+                return
+            logger.warning(f"Maintenance chat stream failed ({str(e)}), using non-streaming chat")
+            try:
+                chat_response = self.maintenance_chat(conversation_history)
+            except AIModelError as error:
+                yield error.to_json() + b"\n"
+                return
+        else:
+            try:
+                chat_response = self._parse_chat_response("".join(parts))
+            except Exception as e:
+                logger.error(f"Failed to parse streamed chat reply: {str(e)}")
+                error = AIModelError(message="Failed to process chat message", details=str(e))
+                yield error.to_json() + b"\n"
+                return
+        
+        yield orjson.dumps(chat_response.model_dump()) + b"\n"
+    
     def generate_text(
         self,
         model_id: str,
@@ -1808,27 +2265,52 @@ STRICT RULES:
             AIModelError: If generation fails
         """
         try:
-            body = self._format_messages_for_bedrock(
-                model_id=model_id,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt
-            )
-            
-            # Add max_tokens and temperature to body
-            if "anthropic" in model_id.lower():
-                body["max_tokens"] = max_tokens
-                body["temperature"] = temperature
-            elif "meta.llama" in model_id.lower():
-                body["max_gen_len"] = max_tokens
-                body["temperature"] = temperature
+            # Converse applies max_tokens/temperature uniformly across providers
+            request = _format_converse(system_prompt, user_prompt, max_tokens, temperature)
             
-            response_text, _ = self._call_bedrock_with_retry(model_id, body)
+            response_text, _ = self._invoke_bedrock(model_id, request, converse=True)
             return response_text
             
         except Exception as e:
             logger.error(f"Error generating text: {str(e)}")
             raise AIModelError(message="Failed to generate text", details=str(e))
     
+    def _extract_request_without_model(
+        self,
+        conversation_history: List[ChatMessage]
+    ) -> Optional[MaintenanceRequestExtraction]:
+        """
+        Resolve a chat extraction locally when the conversation already holds the answer
+        
+        Uses the title/description JSON from the latest assistant message if it has one,
+        or a lone user message short enough to serve as the title.
+        
+        Returns:
+            MaintenanceRequestExtraction, or None when the model is needed
+        """
+        for msg in reversed(conversation_history):
+            if msg.role != "assistant":
+                continue
+            if "{" in msg.content:
+                json_str = self._extract_json_from_markdown(msg.content)
+                if json_str is not None:
+                    try:
+                        data = orjson.loads(json_str)
+                    except orjson.JSONDecodeError:
+                        data = None
+                    if isinstance(data, dict):
+                        title, description = data.get("title"), data.get("description")
+                        if isinstance(title, str) and isinstance(description, str) and title and description:
+                            return MaintenanceRequestExtraction(title=title[:80], description=description)
+            break
+        
+        if len(conversation_history) == 1:
+            content = conversation_history[0].content.strip()
+            if conversation_history[0].role == "user" and 0 < len(content) <= 80:
+                return MaintenanceRequestExtraction(title=content, description=content)
+        
+        return None
+    
     def extract_maintenance_request_from_chat(
         self,
         conversation_history: List[ChatMessage]
@@ -1847,16 +2329,17 @@ STRICT RULES:
             start_time = time.time()
             logger.info("Extracting maintenance request from chat conversation")
             
+            shortcut = self._extract_request_without_model(conversation_history)
+            if shortcut is not None:
+                logger.info("Extraction resolved from the conversation without a model call")
+                return shortcut
+            
             # Use Haiku (fast and cheap)
             model = settings.FREE_MODEL
             
-            # Build conversation context
-            messages = [{"role": msg.role, "content": msg.content} for msg in conversation_history]
-            
-            # Use prompt builder from chat_prompts module
             # Note: build_maintenance_extraction_prompt returns a full extraction prompt
             # We'll use a simpler inline version for title/description extraction
-            conversation_text = "\n\n".join([f"{msg['role'].upper()}: {msg['content']}" for msg in messages])
+            conversation_text = _chat_transcript(_windowed_history(conversation_history))
             
             system_prompt = """Extract a maintenance request from the tenant's conversation.
 
@@ -1884,17 +2367,17 @@ EXAMPLES:
 
             body = {
                 "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 500,  # Increased for vague conversations that need more explanation
+                "max_tokens": _EXTRACTION_MAX_TOKENS,  # Title + description fits well within this budget
                 "temperature": 0.0,  # Deterministic
-                "system": system_prompt,
+                "system": _anthropic_system(system_prompt),
                 "messages": [{"role": "user", "content": f"Extract maintenance request from this conversation:\n\n{conversation_text}"}]
             }
             
-            response_text, _ = self._call_bedrock_with_retry(model, body)
+            response_text, _ = self._invoke_bedrock(model, body)
             elapsed_time = time.time() - start_time
             
             logger.info(f"Extraction completed in {elapsed_time:.2f}s")
-            logger.debug(f"Raw AI response: {response_text}")
+            logger.debug("Raw AI response: %s", response_text)
             
             # Parse JSON response with robust error handling
             try:
@@ -1902,8 +2385,7 @@ EXAMPLES:
                 if not json_str:
                     json_str = response_text
                 
-                json_str = self._sanitize_json_string(json_str)
-                parsed = json.loads(json_str)
+                parsed = self._parse_json(json_str)
                 
                 # Truncate title to 80 chars if needed
                 title = parsed.get("title", "Maintenance request")[:80]
@@ -1911,7 +2393,8 @@ EXAMPLES:
                 
             except json.JSONDecodeError as e:
                 logger.error(f"JSON parsing failed: {str(e)}")
-                logger.error(f"Failed to parse response: {response_text}")
+                logger.error("Failed to parse response (%d chars): %s", len(response_text), response_text[:256])
+                logger.debug("Unparsed response: %s", response_text)
                 # Fallback: extract first user message as title
                 first_user_msg = next((msg.content for msg in conversation_history if msg.role == "user"), "Maintenance issue")
                 title = first_user_msg[:80]
@@ -1925,3 +2408,40 @@ EXAMPLES:
         except Exception as e:
             logger.error(f"Error extracting maintenance request: {str(e)}")
             raise AIModelError(message="Failed to extract maintenance request", details=str(e))
+    
+    async def _run_blocking(self, method, *args):
+        """Run a blocking client method on the default executor so callers can await it"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(method, *args))
+    
+    async def arewrite_tenant_message(self, tenant_message: str) -> TenantMessageRewrite:
+        """Awaitable rewrite_tenant_message"""
+        return await self._run_blocking(self.rewrite_tenant_message, tenant_message)
+    
+    async def aevaluate_move_out_request(
+        self,
+        move_out_request: str,
+        lease_info: LeaseInfo,
+        owner_notes: Optional[str] = None
+    ) -> MoveOutResponse:
+        """Awaitable evaluate_move_out_request"""
+        return await self._run_blocking(
+            self.evaluate_move_out_request, move_out_request, lease_info, owner_notes
+        )
+    
+    async def amaintenance_chat(self, conversation_history: List[ChatMessage]) -> MaintenanceChatResponse:
+        """Awaitable maintenance_chat"""
+        return await self._run_blocking(self.maintenance_chat, conversation_history)
+    
+    async def aextract_maintenance_request_from_chat(
+        self,
+        conversation_history: List[ChatMessage]
+    ) -> MaintenanceRequestExtraction:
+        """
+        Awaitable extract_maintenance_request_from_chat
+        
+        Independent calls can be fanned out with asyncio.gather, e.g.
+        ``await asyncio.gather(client.amaintenance_chat(h), client.aextract_maintenance_request_from_chat(h))``,
+        so the wall time is that of the slowest call.
+        """
+        return await self._run_blocking(self.extract_maintenance_request_from_chat, conversation_history)
@@ -0,0 +1,239 @@
+"""
+Helpers shared by the Bedrock clients (BedrockClient and the app.clients package)
+"""
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Translation table dropping control characters JSON cannot contain raw (keeps tab, LF, CR),
+# plus DEL and byte-order marks some models emit, so sanitizing stays a single pass
+BAD_CTRL = dict.fromkeys([code for code in range(32) if code not in (9, 10, 13)], None)
+BAD_CTRL[0x7F] = None
+BAD_CTRL[0xFEFF] = None
+
+
+@lru_cache(maxsize=64)
+def provider_for(model_id: str) -> str:
+    """Extract provider from a Bedrock model ID or inference profile ID (us.provider.model)"""
+    if model_id.startswith("us."):
+        # Inference profile ID: us.anthropic.claude... -> anthropic
+        return model_id.split(".")[1]
+    if "." in model_id:
+        # Direct model ID: anthropic.claude... -> anthropic
+        return model_id.split(".")[0]
+    return model_id
+
+
+def scan_json_block(text: str, start: int) -> Optional[int]:
+    """
+    Find the end of the JSON object opening at text[start] ("{")
+
+    Walks forward once tracking brace depth, ignoring braces inside string values.
+
+    Returns:
+        Index just past the matching closing brace, or None if the object never closes
+    """
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+
+    return None
+
+
+def fix_truncated_json(json_str: str) -> str:
+    """
+    Attempt to fix truncated/incomplete JSON
+
+    Walks the string once, tracking string/escape state and a stack of open
+    containers (brackets inside string values are ignored), then closes whatever
+    is still open. A truncated string value is closed in place; a truncated key,
+    or a key cut off before its colon, is dropped.
+
+    Args:
+        json_str: Potentially truncated JSON string
+
+    Returns:
+        Fixed JSON string
+    """
+    closers = []
+    in_string = False
+    escape = False
+    string_start = -1
+    string_is_key = False
+    dangling_key_start = -1
+    last_significant = ""
+
+    for index, char in enumerate(json_str):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+                last_significant = char
+                if string_is_key:
+                    dangling_key_start = string_start
+        elif char == '"':
+            in_string = True
+            string_start = index
+            string_is_key = bool(closers) and closers[-1] == "}" and last_significant in "{,"
+        elif char == "{":
+            closers.append("}")
+            last_significant = char
+        elif char == "[":
+            closers.append("]")
+            last_significant = char
+        elif char in "}]":
+            if closers:
+                closers.pop()
+            last_significant = char
+        elif not char.isspace():
+            dangling_key_start = -1
+            last_significant = char
+
+    if not closers and not in_string:
+        return json_str
+
+    logger.warning(f"JSON appears truncated: {len(closers)} unclosed container(s), inside string: {in_string}")
+
+    if in_string:
+        if string_is_key:
+            json_str = json_str[:string_start]
+        else:
+            if escape:
+                json_str = json_str[:-1]
+            json_str += '"'
+    elif dangling_key_start != -1 and last_significant == '"':
+        json_str = json_str[:dangling_key_start]
+
+    json_str = json_str.rstrip()
+    if json_str.endswith(","):
+        json_str = json_str[:-1]
+    elif json_str.endswith(":"):
+        json_str += "null"
+
+    return json_str + "".join(reversed(closers))
+
+
+# Text deltas carried by each provider's response-stream chunks
+STREAM_DELTA_EXTRACTORS = {
+    "anthropic": lambda chunk: chunk.get("delta", {}).get("text", "") if chunk.get("type") == "content_block_delta" else "",
+    "meta": lambda chunk: chunk.get("generation") or "",
+    "mistral": lambda chunk: chunk["outputs"][0].get("text", "") if chunk.get("outputs") else "",
+}
+
+
+class JsonObjectTracker:
+    """Tracks brace depth over streamed text to detect when the first top-level JSON object closes"""
+
+    __slots__ = ("depth", "started", "in_string", "escape")
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, text: str) -> bool:
+        """Consume a text delta; returns True once the top-level object is complete"""
+        for char in text:
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                # Quotes in prose before the object starts are not JSON strings
+                self.in_string = self.started
+            elif char == "{":
+                self.depth += 1
+                self.started = True
+            elif char == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+def read_response_stream(events: Iterable[Dict], provider: str) -> tuple[str, Dict[str, int]]:
+    """
+    Collect the JSON answer and token usage from an InvokeModelWithResponseStream body
+
+    Text is kept only up to the close of the first top-level JSON object, but the
+    stream is read to the end: Bedrock reports invocation metrics (token counts)
+    on the final chunk only.
+
+    Args:
+        events: The response's 'body' event stream (closed when done)
+        provider: Model provider, a key of STREAM_DELTA_EXTRACTORS
+
+    Returns:
+        Tuple of (response_text, token_usage); token_usage has prompt, completion
+        and total counts, plus cache_read/cache_write when prompt caching was used
+    """
+    extract_delta = STREAM_DELTA_EXTRACTORS[provider]
+    tracker = JsonObjectTracker()
+    parts = []
+    complete = False
+    metrics = {}
+
+    try:
+        for event in events:
+            chunk_bytes = event.get('chunk', {}).get('bytes')
+            if not chunk_bytes:
+                continue
+
+            chunk = orjson.loads(chunk_bytes)
+            metrics = chunk.get('amazon-bedrock-invocationMetrics', metrics)
+            if complete:
+                continue
+
+            text = extract_delta(chunk)
+            if text:
+                parts.append(text)
+                if tracker.feed(text):
+                    logger.info("JSON response complete, draining Bedrock stream for usage metrics")
+                    complete = True
+    finally:
+        close = getattr(events, 'close', None)
+        if close is not None:
+            close()
+
+    cache_read_tokens = metrics.get('cacheReadInputTokenCount', 0)
+    cache_write_tokens = metrics.get('cacheWriteInputTokenCount', 0)
+    prompt_tokens = metrics.get('inputTokenCount', 0) + cache_read_tokens + cache_write_tokens
+    completion_tokens = metrics.get('outputTokenCount', 0)
+    tokens_used = {
+        "prompt": prompt_tokens,
+        "completion": completion_tokens,
+        "total": prompt_tokens + completion_tokens
+    }
+    if cache_read_tokens or cache_write_tokens:
+        tokens_used["cache_read"] = cache_read_tokens
+        tokens_used["cache_write"] = cache_write_tokens
+    return "".join(parts), tokens_used
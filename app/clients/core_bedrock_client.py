@@ -1,18 +1,135 @@
 """Core AWS Bedrock client with shared functionality for all specialized clients"""
 
 import json
+import random
 import time
 import re
+from functools import lru_cache
 from typing import Dict, Optional
 import logging
 import boto3
+import orjson
 from botocore.exceptions import ClientError, ReadTimeoutError, ConnectTimeoutError
 
 from app.config import settings
 from app.exceptions import AITimeoutError, AIModelError
+from app.bedrock_utils import (
+    BAD_CTRL,
+    STREAM_DELTA_EXTRACTORS,
+    fix_truncated_json,
+    provider_for,
+    read_response_stream,
+    scan_json_block,
+)
 
 logger = logging.getLogger(__name__)
 
+# Trailing markdown fence left on an unterminated JSON block, compiled once at import
+_TRAILING_FENCE = re.compile(r'```\s*$')
+
+
+def _anthropic_body(system_prompt: str, user_prompt: str) -> Dict:
+    """Claude Messages API request body"""
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 16000,
+        "temperature": 0.1,
+        "system": system_prompt,
+        "messages": [{"role": "user", "content": user_prompt}]
+    }
+
+
+def _meta_body(system_prompt: str, user_prompt: str) -> Dict:
+    """Llama 3 request body - max_gen_len must be <= 8192"""
+    return {
+        "prompt": f"<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n{system_prompt}<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{user_prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n",
+        "max_gen_len": 8192,
+        "temperature": 0.1,
+        "top_p": 0.9
+    }
+
+
+def _mistral_body(system_prompt: str, user_prompt: str) -> Dict:
+    """Mistral request body for AWS Bedrock"""
+    return {
+        "prompt": f"{system_prompt}\n\n{user_prompt}",
+        "max_tokens": 8192,
+        "temperature": 0.1,
+        "top_p": 0.9
+    }
+
+
+# invoke_model request body builders per provider
+_BODY_FORMATTERS = {
+    "anthropic": _anthropic_body,
+    "meta": _meta_body,
+    "mistral": _mistral_body,
+}
+
+# Text bodies returned by each provider's invoke_model response
+_TEXT_EXTRACTORS = {
+    "anthropic": lambda body: body['content'][0]['text'],
+    "meta": lambda body: body['generation'],
+    "mistral": lambda body: body['outputs'][0]['text'],
+}
+
+# (prompt, completion) token counts reported by each provider's invoke_model response
+_USAGE_EXTRACTORS = {
+    "anthropic": lambda body: (
+        body.get('usage', {}).get('input_tokens', 0),
+        body.get('usage', {}).get('output_tokens', 0),
+    ),
+    "meta": lambda body: (body.get('prompt_token_count', 0), body.get('generation_token_count', 0)),
+    "mistral": lambda body: (body.get('prompt_token_count', 0), body.get('generation_token_count', 0)),
+}
+
+
+@lru_cache(maxsize=None)
+def _get_bedrock_client(region: str, access_key_id: Optional[str], secret_access_key: Optional[str]):
+    """
+    Build one bedrock-runtime client per region/credential set for the whole process
+    
+    Session construction resolves credentials (IMDS round-trips on EC2) and the client
+    loads the service model, so every CoreBedrockClient instance shares this one.
+    """
+    session_kwargs = {'region_name': region}
+    
+    # Add credentials if provided (for local testing)
+    if access_key_id and secret_access_key:
+        logger.info("Using AWS credentials from environment variables")
+        session_kwargs['aws_access_key_id'] = access_key_id
+        session_kwargs['aws_secret_access_key'] = secret_access_key
+    else:
+        logger.info("Using IAM role credentials (EC2)")
+    
+    session = boto3.Session(**session_kwargs)
+    return session.client(
+        service_name='bedrock-runtime',
+        config=boto3.session.Config(
+            read_timeout=180,
+            connect_timeout=10,
+            retries={'max_attempts': 2, 'mode': 'adaptive'},
+            # Same pool as BedrockClient; lease extraction sizes its own LeaseBedrockClient pool
+            max_pool_connections=50,
+            tcp_keepalive=True,  # Keep idle pooled connections from being dropped between requests
+            user_agent_extra='melkai/1.0'
+        )
+    )
+
+
+def _supports_latency_config(client) -> bool:
+    """
+    Whether the client's service model accepts performanceConfigLatency
+    
+    The parameter only exists in newer botocore releases; older service models reject
+    it with ParamValidationError on every call.
+    """
+    service_model = client.meta.service_model
+    return all(
+        'performanceConfigLatency' in service_model.operation_model(operation).input_shape.members
+        for operation in ('InvokeModel', 'InvokeModelWithResponseStream')
+    )
+
 
 class CoreBedrockClient:
     """
@@ -39,6 +156,22 @@ class CoreBedrockClient:
         "mistral.mistral-small-2402-v1:0": {"input": 0.2, "output": 0.6},
     }
     
+    # Per-token (input, output) rates derived from MODEL_PRICING (USD per 1M tokens)
+    _RATE = {
+        model: (price["input"] * 1e-6, price["output"] * 1e-6)
+        for model, price in MODEL_PRICING.items()
+    }
+    
+    # Delay between retries of timed-out or throttled Bedrock calls
+    MAX_BACKOFF_SECONDS = 30.0
+    
+    # Inference profiles that support Bedrock latency-optimized inference
+    LATENCY_OPTIMIZED_MODELS = frozenset({
+        "us.anthropic.claude-3-5-haiku-20241022-v1:0",
+        "us.meta.llama3-1-70b-instruct-v1:0",
+        "us.meta.llama3-1-405b-instruct-v1:0",
+    })
+    
     def __init__(self):
         """
         Initialize Bedrock client with AWS credentials.
@@ -50,31 +183,21 @@ class CoreBedrockClient:
             AIModelError: If client initialization fails
         """
         try:
-            # Configure boto3 client
-            session_kwargs = {'region_name': settings.AWS_REGION}
-            
-            # Add credentials if provided (for local testing)
-            if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-                logger.info("Using AWS credentials from environment variables")
-                session_kwargs['aws_access_key_id'] = settings.AWS_ACCESS_KEY_ID
-                session_kwargs['aws_secret_access_key'] = settings.AWS_SECRET_ACCESS_KEY
-            else:
-                logger.info("Using IAM role credentials (EC2)")
-            
-            # Create boto3 session and client
-            session = boto3.Session(**session_kwargs)
-            
-            self.client = session.client(
-                service_name='bedrock-runtime',
-                config=boto3.session.Config(
-                    read_timeout=180,
-                    connect_timeout=10,
-                    retries={'max_attempts': 2, 'mode': 'adaptive'}
-                )
+            self.client = _get_bedrock_client(
+                settings.AWS_REGION,
+                settings.AWS_ACCESS_KEY_ID,
+                settings.AWS_SECRET_ACCESS_KEY
             )
             
             logger.info(f"Bedrock client initialized for region: {settings.AWS_REGION}")
             
+            self._latency_optimized = settings.BEDROCK_LATENCY_OPTIMIZED and _supports_latency_config(self.client)
+            if settings.BEDROCK_LATENCY_OPTIMIZED and not self._latency_optimized:
+                logger.warning(
+                    "BEDROCK_LATENCY_OPTIMIZED is set but the installed botocore has no "
+                    "performanceConfigLatency parameter; using standard inference"
+                )
+            
         except Exception as e:
             logger.error(f"Failed to initialize Bedrock client: {str(e)}")
             raise AIModelError(
@@ -93,16 +216,7 @@ class CoreBedrockClient:
         Returns:
             Cleaned JSON string safe for parsing
         """
-        sanitized = ""
-        for char in json_str:
-            code = ord(char)
-            if code >= 32:
-                sanitized += char
-            elif code in [9, 10, 13]:  # Tab, newline, carriage return
-                sanitized += char
-        
-        sanitized = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F]', '', sanitized)
-        return sanitized
+        return json_str.translate(BAD_CTRL)
     
     def _extract_json_from_markdown(self, text: str) -> Optional[str]:
         """
@@ -114,27 +228,23 @@ class CoreBedrockClient:
         Returns:
             Extracted JSON string or None if not found
         """
-        # Try to find JSON in markdown code blocks
-        json_block_patterns = [
-            r'```json\s*(\{.*?\})\s*```',
-            r'```\s*(\{.*?\})\s*```',
-        ]
-        
-        for pattern in json_block_patterns:
-            match = re.search(pattern, text, re.DOTALL)
-            if match:
-                logger.info("Found JSON within markdown code block")
-                json_str = match.group(1).strip()
-                return self._fix_truncated_json(json_str)
-        
-        # Try incomplete markdown blocks
-        incomplete_pattern = r'```(?:json)?\s*(\{.*)'
-        match = re.search(incomplete_pattern, text, re.DOTALL)
-        if match:
-            logger.warning("Found incomplete markdown block")
-            json_str = match.group(1).strip()
-            json_str = re.sub(r'```\s*$', '', json_str)
-            return self._fix_truncated_json(json_str)
+        # Prefer a ```json fence, then any code fence; one forward scan finds the object's end
+        fence = text.find("```json")
+        if fence == -1:
+            fence = text.find("```")
+        
+        if fence != -1:
+            json_start = text.find("{", fence)
+            if json_start != -1:
+                json_end = scan_json_block(text, json_start)
+                if json_end is not None:
+                    # A closed object needs no truncation repair
+                    logger.info("Found JSON within markdown code block")
+                    return text[json_start:json_end]
+                
+                logger.warning("Found incomplete markdown block")
+                json_str = _TRAILING_FENCE.sub('', text[json_start:].strip())
+                return fix_truncated_json(json_str)
         
         # Extract JSON without markdown
         json_start = text.find("{")
@@ -143,46 +253,11 @@ class CoreBedrockClient:
         if json_start != -1 and json_end > json_start:
             logger.info("Found JSON without markdown code block")
             json_str = text[json_start:json_end].strip()
-            return self._fix_truncated_json(json_str)
+            return fix_truncated_json(json_str)
         
         logger.error("Could not find JSON in response")
         return None
     
-    def _fix_truncated_json(self, json_str: str) -> str:
-        """
-        Attempt to fix truncated/incomplete JSON by closing open brackets.
-        
-        Args:
-            json_str: Potentially truncated JSON string
-            
-        Returns:
-            Fixed JSON string
-        """
-        open_braces = json_str.count('{')
-        close_braces = json_str.count('}')
-        open_brackets = json_str.count('[')
-        close_brackets = json_str.count(']')
-        
-        if open_braces == close_braces and open_brackets == close_brackets:
-            return json_str
-        
-        logger.warning(f"JSON appears truncated: {{ {open_braces}/{close_braces}, [ {open_brackets}/{close_brackets}")
-        
-        # Remove incomplete strings at the end
-        json_str = re.sub(r',?\s*"[^"]*$', '', json_str)
-        
-        # Close open brackets
-        while open_brackets > close_brackets:
-            json_str += ']'
-            close_brackets += 1
-        
-        # Close open braces
-        while open_braces > close_braces:
-            json_str += '}'
-            close_braces += 1
-        
-        return json_str
-    
     def _format_messages_for_bedrock(
         self,
         model_id: str,
@@ -203,48 +278,14 @@ class CoreBedrockClient:
         Raises:
             AIModelError: If model format is not supported
         """
-        # Handle inference profile IDs (us.provider.model) by extracting provider
-        if model_id.startswith("us."):
-            provider = model_id.split(".")[1]
-        elif "." in model_id:
-            provider = model_id.split(".")[0]
-        else:
-            provider = model_id
-        
-        if provider == "anthropic":
-            # Claude format
-            return {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 16000,
-                "temperature": 0.1,
-                "system": system_prompt,
-                "messages": [{"role": "user", "content": user_prompt}]
-            }
-        
-        elif provider == "meta":
-            # Llama format - max_gen_len must be <= 8192
-            return {
-                "prompt": f"<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n{system_prompt}<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{user_prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n",
-                "max_gen_len": 8192,
-                "temperature": 0.1,
-                "top_p": 0.9
-            }
-        
-        elif provider == "mistral":
-            # Mistral format for AWS Bedrock
-            combined_prompt = f"{system_prompt}\n\n{user_prompt}"
-            return {
-                "prompt": combined_prompt,
-                "max_tokens": 8192,
-                "temperature": 0.1,
-                "top_p": 0.9
-            }
-        
-        else:
+        format_body = _BODY_FORMATTERS.get(provider_for(model_id))
+        if format_body is None:
             raise AIModelError(
                 message=f"Unsupported model: {model_id}",
                 details="Model format not recognized"
             )
+        
+        return format_body(system_prompt, user_prompt)
     
     def _extract_text_from_response(self, model_id: str, response_body: Dict) -> str:
         """
@@ -260,27 +301,16 @@ class CoreBedrockClient:
         Raises:
             AIModelError: If response format is not supported or parsing fails
         """
-        # Handle inference profile IDs (us.provider.model) by extracting provider
-        if model_id.startswith("us."):
-            provider = model_id.split(".")[1]
-        elif "." in model_id:
-            provider = model_id.split(".")[0]
-        else:
-            provider = model_id
+        extract_text = _TEXT_EXTRACTORS.get(provider_for(model_id))
+        if extract_text is None:
+            raise AIModelError(
+                message=f"Unsupported model response format: {model_id}",
+                details="Cannot extract text from response"
+            )
         
         try:
-            if provider == "anthropic":
-                return response_body['content'][0]['text']
-            elif provider == "meta":
-                return response_body['generation']
-            elif provider == "mistral":
-                return response_body['outputs'][0]['text']
-            else:
-                raise AIModelError(
-                    message=f"Unsupported model response format: {model_id}",
-                    details="Cannot extract text from response"
-                )
-                
+            return extract_text(response_body)
+            
         except KeyError as e:
             logger.error(f"Failed to extract text from response: {str(e)}")
             logger.error(f"Response body: {json.dumps(response_body, indent=2)}")
@@ -300,28 +330,13 @@ class CoreBedrockClient:
         Returns:
             Dictionary with prompt, completion, and total tokens
         """
-        # Handle inference profile IDs (us.provider.model) by extracting provider
-        if model_id.startswith("us."):
-            provider = model_id.split(".")[1]
-        elif "." in model_id:
-            provider = model_id.split(".")[0]
-        else:
-            provider = model_id
+        extract_usage = _USAGE_EXTRACTORS.get(provider_for(model_id))
         
         try:
-            if provider == "anthropic":
-                usage = response_body.get('usage', {})
-                prompt_tokens = usage.get('input_tokens', 0)
-                completion_tokens = usage.get('output_tokens', 0)
-            elif provider == "meta":
-                prompt_tokens = response_body.get('prompt_token_count', 0)
-                completion_tokens = response_body.get('generation_token_count', 0)
-            elif provider == "mistral":
-                prompt_tokens = response_body.get('prompt_token_count', 0)
-                completion_tokens = response_body.get('generation_token_count', 0)
+            if extract_usage is None:
+                prompt_tokens = completion_tokens = 0
             else:
-                prompt_tokens = 0
-                completion_tokens = 0
+                prompt_tokens, completion_tokens = extract_usage(response_body)
             
             return {
                 "prompt": prompt_tokens,
@@ -333,10 +348,25 @@ class CoreBedrockClient:
             logger.warning(f"Failed to extract token usage: {str(e)}")
             return {"prompt": 0, "completion": 0, "total": 0}
     
+    def _invoke_streaming(self, model_id: str, request: Dict) -> tuple[str, Dict[str, int]]:
+        """
+        Invoke model with response streaming, keeping the text up to the end of the JSON answer.
+        
+        Args:
+            model_id: Bedrock model identifier
+            request: InvokeModel keyword arguments (modelId, encoded body, ...)
+            
+        Returns:
+            Tuple of (response_text, token_usage) from read_response_stream
+        """
+        response = self.client.invoke_model_with_response_stream(**request)
+        return read_response_stream(response['body'], provider_for(model_id))
+    
     def _call_bedrock_with_retry(
         self,
         model_id: str,
-        body: Dict
+        body: Dict,
+        stream: bool = False
     ) -> tuple[str, Dict[str, int]]:
         """
         Call Bedrock API with automatic retry logic.
@@ -344,6 +374,7 @@ class CoreBedrockClient:
         Args:
             model_id: Bedrock model identifier
             body: Request body formatted for the specific model
+            stream: Read the response as a stream, keeping only the text up to the end of the JSON answer
             
         Returns:
             Tuple of (response_text, token_usage)
@@ -358,13 +389,17 @@ class CoreBedrockClient:
         for attempt in range(max_retries):
             try:
                 # Call Bedrock API
-                response = self.client.invoke_model(
-                    modelId=model_id,
-                    body=json.dumps(body)
-                )
+                request = {"modelId": model_id, "body": orjson.dumps(body)}
+                if self._latency_optimized and model_id in self.LATENCY_OPTIMIZED_MODELS:
+                    request["performanceConfigLatency"] = "optimized"
+                
+                if stream and provider_for(model_id) in STREAM_DELTA_EXTRACTORS:
+                    return self._invoke_streaming(model_id, request)
+                
+                response = self.client.invoke_model(**request)
                 
                 # Parse response
-                response_body = json.loads(response['body'].read())
+                response_body = orjson.loads(response['body'].read())
                 
                 # Extract text and tokens
                 text = self._extract_text_from_response(model_id, response_body)
@@ -375,8 +410,8 @@ class CoreBedrockClient:
             except (ReadTimeoutError, ConnectTimeoutError) as e:
                 last_error = e
                 if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Bedrock timeout on attempt {attempt + 1}, retrying in {wait_time}s...")
+                    wait_time = self._retry_backoff(attempt)
+                    logger.warning(f"Bedrock timeout on attempt {attempt + 1}, retrying in {wait_time:.2f}s...")
                     time.sleep(wait_time)
                 else:
                     raise AITimeoutError(timeout_seconds=120)
@@ -384,20 +419,22 @@ class CoreBedrockClient:
             except ClientError as e:
                 error_code = e.response['Error']['Code']
                 error_message = e.response['Error']['Message']
+                # Response-stream error events use lower camel case ("throttlingException")
+                normalized_code = error_code.lower()
                 
-                if error_code == 'ThrottlingException':
+                if normalized_code == 'throttlingexception':
                     if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt
-                        logger.warning(f"Bedrock throttled, retrying in {wait_time}s...")
+                        wait_time = self._retry_backoff(attempt)
+                        logger.warning(f"Bedrock throttled, retrying in {wait_time:.2f}s...")
                         time.sleep(wait_time)
                     else:
                         raise AIModelError(
                             message="AWS Bedrock rate limit exceeded",
                             details="Too many requests. Please try again later."
                         )
-                elif error_code == 'ModelTimeoutException':
+                elif normalized_code in ('modeltimeoutexception', 'modelstreamerrorexception'):
                     raise AITimeoutError(timeout_seconds=120)
-                elif error_code == 'AccessDeniedException':
+                elif normalized_code == 'accessdeniedexception':
                     raise AIModelError(
                         message="Access denied to AWS Bedrock",
                         details="Check IAM permissions or enable model access in AWS Console"
@@ -423,6 +460,11 @@ class CoreBedrockClient:
                 details=str(last_error)
             )
     
+    def _retry_backoff(self, attempt: int) -> float:
+        """Equal-jitter exponential backoff for the given (0-based) attempt, capped at MAX_BACKOFF_SECONDS"""
+        half = min(self.MAX_BACKOFF_SECONDS, 2 ** attempt) / 2
+        return half + random.uniform(0, half)
+    
     def calculate_cost(self, model_name: str, tokens_used: Dict[str, int]) -> float:
         """
         Calculate the cost of API usage based on token usage.
@@ -434,9 +476,9 @@ class CoreBedrockClient:
         Returns:
             Cost in USD
         """
-        pricing = self.MODEL_PRICING.get(model_name, {"input": 0, "output": 0})
-        
-        prompt_cost = (tokens_used.get("prompt", 0) / 1_000_000) * pricing["input"]
-        completion_cost = (tokens_used.get("completion", 0) / 1_000_000) * pricing["output"]
+        input_rate, output_rate = self._RATE.get(model_name, (0.0, 0.0))
         
-        return prompt_cost + completion_cost
+        return (
+            tokens_used.get("prompt", 0) * input_rate
+            + tokens_used.get("completion", 0) * output_rate
+        )
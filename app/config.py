@@ -1,5 +1,6 @@
+from functools import cached_property
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 
 class Settings(BaseSettings):
@@ -14,10 +15,21 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     
+    # Legacy OpenRouter client (app/openrouter_client.py) - unused by the Bedrock deployment
+    OPENROUTER_API_KEY: Optional[str] = None
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    
     # Model Configuration
     # Use cross-region inference profiles (us. prefix) for on-demand access
     FREE_MODEL: str = "us.anthropic.claude-3-5-haiku-20241022-v1:0"  # Claude 3.5 Haiku - Fast and cost-effective for all APIs
     LEASE_GENERATOR_MODEL: str = "us.anthropic.claude-3-5-haiku-20241022-v1:0"  # Claude 3.5 Haiku - Fastest for lease generation
+    CATEGORIZED_ANALYSIS_HEDGE: bool = False  # Query primary and fallback models concurrently (lower tail latency, doubles token cost)
+    BEDROCK_PROMPT_CACHING: bool = False  # Mark Claude system prompts with cache_control (cached reads bill at 10%, writes at 125%)
+    BEDROCK_LATENCY_OPTIMIZED: bool = False  # Request latency-optimized inference for models that support it (billed at a premium)
+    FALLBACK_MODELS: List[str] = [  # Tried in order after FREE_MODEL when it is throttled, timing out or denied
+        "us.anthropic.claude-3-haiku-20240307-v1:0",
+        "us.meta.llama3-1-8b-instruct-v1:0",
+    ]
     
     # AWS Bedrock Models - All use DuckDuckGo search (no native search in Bedrock)
     # Use cross-region inference profiles (us. prefix) for on-demand throughput
@@ -40,23 +52,28 @@ class Settings(BaseSettings):
     ]
     
     # AWS Bedrock has NO native search - all models use DuckDuckGo
-    MODELS_WITH_NATIVE_SEARCH: List[str] = []
+    MODELS_WITH_NATIVE_SEARCH: FrozenSet[str] = frozenset()
     
     # Deprecated properties (for backward compatibility)
     @property
     def MODELS_WITH_SEARCH(self) -> List[str]:
         """Legacy property - returns models with native search"""
-        return self.MODELS_WITH_NATIVE_SEARCH
+        return list(self.MODELS_WITH_NATIVE_SEARCH)
     
     @property
     def MODELS_WITHOUT_SEARCH(self) -> List[str]:
         """Legacy property - returns models without native search"""
-        return [m for m in self.ALL_MODELS if m not in self.MODELS_WITH_NATIVE_SEARCH]
+        return self.MODELS_WITHOUT_NATIVE_SEARCH
     
     @property
     def MODELS_WITHOUT_NATIVE_SEARCH(self) -> List[str]:
         """Models that don't have built-in web search (for DuckDuckGo endpoint)"""
-        return [m for m in self.ALL_MODELS if m not in self.MODELS_WITH_NATIVE_SEARCH]
+        return list(self._models_without_native_search)
+    
+    @cached_property
+    def _models_without_native_search(self) -> tuple:
+        """Immutable MODELS_WITHOUT_NATIVE_SEARCH, computed once"""
+        return tuple(m for m in self.ALL_MODELS if m not in self.MODELS_WITH_NATIVE_SEARCH)
     
     # Application settings
     MAX_FILE_SIZE_MB: int = 10
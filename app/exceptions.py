@@ -2,152 +2,233 @@
 
 from typing import Optional, Dict, Any
 
+import orjson
+
 
 class APIException(Exception):
     """Base exception for API errors"""
+    # Always-set fields live in slots; class-default overrides fall back to the
+    # instance __dict__ BaseException provides, which is only allocated when used
+    __slots__ = ('message', '_base_dict', '_json')
+    
+    # Per-class defaults - subclasses declare the fields that never vary per instance,
+    # and __init__ only stores values that differ from them
+    error_code: str
+    details: Optional[str] = None
+    suggestion: Optional[str] = None
+    status_code: int = 500
+    
     def __init__(
         self,
         message: str,
         error_code: str,
         details: Optional[str] = None,
         suggestion: Optional[str] = None,
-        status_code: int = 500
+        status_code: Optional[int] = None
     ):
         self.message = message
-        self.error_code = error_code
-        self.details = details
-        self.suggestion = suggestion
-        self.status_code = status_code
+        if error_code != getattr(type(self), "error_code", None):
+            self.error_code = error_code
+        if details is not None:
+            self.details = details
+        if suggestion is not None:
+            self.suggestion = suggestion
+        if status_code is not None:
+            self.status_code = status_code
         super().__init__(message)
+        
+        # Response payload is fixed at construction, so build it once
+        self._base_dict = {"error": self.error_code, "message": message}
+        if self.details:
+            self._base_dict["details"] = self.details
+        if self.suggestion:
+            self._base_dict["suggestion"] = self.suggestion
+        self._json = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to structured error response"""
-        error_dict = {
-            "error": self.error_code,
-            "message": self.message
-        }
-        if self.details:
-            error_dict["details"] = self.details
-        if self.suggestion:
-            error_dict["suggestion"] = self.suggestion
-        return error_dict
+        return self._base_dict.copy()
+    
+    def to_json(self) -> bytes:
+        """Serialized error response, encoded on first use and reused after"""
+        if self._json is None:
+            self._json = orjson.dumps(self._base_dict)
+        return self._json
 
 
 class ValidationError(APIException):
     """Raised when input validation fails"""
+    __slots__ = ()
+    
+    error_code = "VALIDATION_ERROR"
+    suggestion = "Please check your input and try again"
+    status_code = 422
+    
     def __init__(self, message: str, details: Optional[str] = None, suggestion: Optional[str] = None):
         super().__init__(
             message=message,
-            error_code="VALIDATION_ERROR",
+            error_code=self.error_code,
             details=details,
-            suggestion=suggestion or "Please check your input and try again",
-            status_code=422
+            suggestion=suggestion or self.suggestion
         )
 
 
 class PDFExtractionError(APIException):
     """Raised when PDF extraction fails"""
+    __slots__ = ()
+    
+    error_code = "PDF_EXTRACTION_FAILED"
+    suggestion = "Please ensure the PDF is not corrupted, password-protected, or scanned. Try uploading a different PDF file."
+    status_code = 400
+    
     def __init__(self, message: str, details: Optional[str] = None):
-        super().__init__(
-            message=message,
-            error_code="PDF_EXTRACTION_FAILED",
-            details=details,
-            suggestion="Please ensure the PDF is not corrupted, password-protected, or scanned. Try uploading a different PDF file.",
-            status_code=400
-        )
+        super().__init__(message=message, error_code=self.error_code, details=details)
 
 
 class PDFTimeoutError(APIException):
     """Raised when PDF extraction times out"""
+    __slots__ = ()
+    
+    error_code = "PDF_TIMEOUT"
+    details = "The PDF file may be too large, corrupted, or contains complex elements"
+    suggestion = "Try uploading a smaller or simpler PDF file"
+    status_code = 408
+    
     def __init__(self, timeout_seconds: int):
         super().__init__(
             message=f"PDF extraction timed out after {timeout_seconds} seconds",
-            error_code="PDF_TIMEOUT",
-            details="The PDF file may be too large, corrupted, or contains complex elements",
-            suggestion="Try uploading a smaller or simpler PDF file",
-            status_code=408
+            error_code=self.error_code
         )
 
 
 class AITimeoutError(APIException):
     """Raised when AI API call times out"""
+    __slots__ = ()
+    
+    error_code = "AI_TIMEOUT"
+    details = "The AI service took too long to respond"
+    suggestion = "Please try again. If the problem persists, try simplifying your request."
+    status_code = 504
+    
     def __init__(self, timeout_seconds: int):
         super().__init__(
             message=f"AI processing timed out after {timeout_seconds} seconds",
-            error_code="AI_TIMEOUT",
-            details="The AI service took too long to respond",
-            suggestion="Please try again. If the problem persists, try simplifying your request.",
-            status_code=504
+            error_code=self.error_code
         )
 
 
 class AIModelError(APIException):
     """Raised when AI model returns an error"""
+    __slots__ = ()
+    
+    error_code = "AI_MODEL_ERROR"
+    suggestion = "The AI service encountered an error. Please try again later."
+    status_code = 502
+    
     def __init__(self, message: str, details: Optional[str] = None):
+        super().__init__(message=message, error_code=self.error_code, details=details)
+
+
+class AIAccessDeniedError(AIModelError):
+    """Raised when the AI provider denies access to the requested model"""
+    __slots__ = ()
+    
+    def __init__(self, details: Optional[str] = None):
         super().__init__(
-            message=message,
-            error_code="AI_MODEL_ERROR",
-            details=details,
-            suggestion="The AI service encountered an error. Please try again later.",
-            status_code=502
+            message="Access denied to AWS Bedrock",
+            details=details
+        )
+
+
+class AIThrottlingError(AIModelError):
+    """Raised when the AI provider keeps rate limiting requests"""
+    __slots__ = ()
+    
+    def __init__(self, details: Optional[str] = None):
+        super().__init__(
+            message="AWS Bedrock rate limit exceeded",
+            details=details
         )
 
 
 class EmptyPDFError(APIException):
     """Raised when PDF contains no extractable text"""
+    __slots__ = ()
+    
+    error_code = "EMPTY_PDF"
+    details = "The PDF appears to be a scanned document or contains only images"
+    suggestion = "Please upload a text-based PDF or use OCR to convert scanned documents to text"
+    status_code = 400
+    
+    # The payload never varies, so every instance shares one encoding
+    _shared_json: Optional[bytes] = None
+    
     def __init__(self):
-        super().__init__(
-            message="PDF contains no extractable text",
-            error_code="EMPTY_PDF",
-            details="The PDF appears to be a scanned document or contains only images",
-            suggestion="Please upload a text-based PDF or use OCR to convert scanned documents to text",
-            status_code=400
-        )
+        super().__init__(message="PDF contains no extractable text", error_code=self.error_code)
+    
+    def to_json(self) -> bytes:
+        """Serialized error response, encoded once for the class"""
+        if EmptyPDFError._shared_json is None:
+            EmptyPDFError._shared_json = orjson.dumps(self._base_dict)
+        return EmptyPDFError._shared_json
 
 
 class FileSizeError(APIException):
     """Raised when uploaded file exceeds size limit"""
+    __slots__ = ()
+    
+    error_code = "FILE_TOO_LARGE"
+    status_code = 413
+    
     def __init__(self, max_size_mb: int):
         super().__init__(
             message=f"File size exceeds {max_size_mb}MB limit",
-            error_code="FILE_TOO_LARGE",
+            error_code=self.error_code,
             details=f"Maximum allowed file size is {max_size_mb}MB",
-            suggestion=f"Please upload a file smaller than {max_size_mb}MB",
-            status_code=413
+            suggestion=f"Please upload a file smaller than {max_size_mb}MB"
         )
 
 
 class UnsupportedFileTypeError(APIException):
     """Raised when uploaded file type is not supported"""
+    __slots__ = ()
+    
+    error_code = "UNSUPPORTED_FILE_TYPE"
+    status_code = 415
+    
     def __init__(self, file_type: str, supported_types: list):
+        supported = ', '.join(supported_types)
         super().__init__(
             message=f"Unsupported file type: {file_type}",
-            error_code="UNSUPPORTED_FILE_TYPE",
-            details=f"Supported file types: {', '.join(supported_types)}",
-            suggestion=f"Please upload one of the following file types: {', '.join(supported_types)}",
-            status_code=415
+            error_code=self.error_code,
+            details=f"Supported file types: {supported}",
+            suggestion=f"Please upload one of the following file types: {supported}"
         )
 
 
 class RateLimitError(APIException):
     """Raised when rate limit is exceeded"""
+    __slots__ = ()
+    
+    error_code = "RATE_LIMIT_EXCEEDED"
+    status_code = 429
+    
     def __init__(self, retry_after_seconds: int = 60):
         super().__init__(
             message="Rate limit exceeded",
-            error_code="RATE_LIMIT_EXCEEDED",
+            error_code=self.error_code,
             details=f"Too many requests. Please retry after {retry_after_seconds} seconds",
-            suggestion=f"Wait {retry_after_seconds} seconds before making another request",
-            status_code=429
+            suggestion=f"Wait {retry_after_seconds} seconds before making another request"
         )
 
 
 class ServerError(APIException):
     """Raised for general server errors"""
+    __slots__ = ()
+    
+    error_code = "SERVER_ERROR"
+    suggestion = "Please try again later. If the problem persists, contact support"
+    status_code = 500
+    
     def __init__(self, message: str, details: Optional[str] = None):
-        super().__init__(
-            message=message,
-            error_code="SERVER_ERROR",
-            details=details,
-            suggestion="Please try again later. If the problem persists, contact support",
-            status_code=500
-        )
+        super().__init__(message=message, error_code=self.error_code, details=details)
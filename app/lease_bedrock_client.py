@@ -4,13 +4,18 @@ AWS Bedrock async client for lease extraction with retry logic and rate limiting
 import asyncio
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import boto3
+import orjson
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
+# Stateless, so one decoder serves every response
+_JSON_DECODER = json.JSONDecoder()
+
 
 class BedrockThrottlingError(Exception):
     """Custom exception for Bedrock throttling"""
@@ -40,6 +45,10 @@ class LeaseBedrockClient:
         )
         
         self.client = self.session.client('bedrock-runtime', config=boto_config)
+        
+        # One worker thread per allowed in-flight call: the loop's default executor is
+        # sized from the CPU count and would cap window extraction below max_concurrent
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="lease-bedrock")
         logger.info(f"Lease Bedrock client initialized (region={self.region}, max_concurrent={self.max_concurrent})")
     
     def _invoke_bedrock_sync(self, model_id: str, prompt: str, temperature: float, max_tokens: int) -> Dict[str, Any]:
@@ -53,11 +62,11 @@ class LeaseBedrockClient:
             }
             
             response = self.client.invoke_model(
-                modelId=model_id, body=json.dumps(request_body),
+                modelId=model_id, body=orjson.dumps(request_body),
                 contentType="application/json", accept="application/json"
             )
             
-            response_body = json.loads(response['body'].read())
+            response_body = orjson.loads(response['body'].read())
             return {
                 'content': response_body['content'][0]['text'],
                 'stop_reason': response_body.get('stop_reason'),
@@ -87,7 +96,7 @@ class LeaseBedrockClient:
             try:
                 loop = asyncio.get_event_loop()
                 response = await asyncio.wait_for(
-                    loop.run_in_executor(None, self._invoke_bedrock_sync, model_id, prompt, temperature, max_tokens),
+                    loop.run_in_executor(self.executor, self._invoke_bedrock_sync, model_id, prompt, temperature, max_tokens),
                     timeout=timeout
                 )
                 logger.debug(f"Bedrock invocation successful (tokens: {response['usage']['input_tokens']}+{response['usage']['output_tokens']})")
@@ -122,34 +131,26 @@ class LeaseBedrockClient:
         # Log first 200 chars of response for debugging
         logger.info(f"Model response preview: {content[:200]}...")
         
-        # Try to extract JSON from markdown code blocks
-        if '```json' in content:
-            start = content.find('```json') + 7
-            end = content.find('```', start)
-            if end > start:
-                content = content[start:end].strip()
-        elif '```' in content:
-            start = content.find('```') + 3
-            end = content.find('```', start)
-            if end > start:
-                content = content[start:end].strip()
-        
-        # Try to extract just the JSON object if there's extra text
-        # Find the first { and try to parse from there
-        if not content.strip().startswith('{'):
-            start_idx = content.find('{')
-            if start_idx >= 0:
-                content = content[start_idx:]
-                logger.debug("Stripped leading text before JSON")
+        # Parse in place from the first "{" after any opening code fence; raw_decode
+        # stops at the end of the object, so the closing fence never has to be located
+        fence = content.find('```json')
+        if fence == -1:
+            fence = content.find('```')
+        start_idx = content.find('{', 0 if fence == -1 else fence + 3)
+        if start_idx < 0:
+            logger.error("Failed to parse JSON from response: no JSON object found")
+            logger.debug(f"Raw content: {content[:500]}...")
+            raise ValueError("Invalid JSON in model response: no JSON object found")
         
         try:
-            # Use json.JSONDecoder to get only the first valid JSON object
+            # Decode only the first valid JSON object
             # This handles cases where there's text after the JSON
-            decoder = json.JSONDecoder()
-            parsed_json, idx = decoder.raw_decode(content)
+            parsed_json, idx = _JSON_DECODER.raw_decode(content, start_idx)
             
             # Check if there's significant text after the JSON
-            remaining = content[idx:].strip()
+            # (up to the closing fence, when the JSON was fenced)
+            remaining_end = content.find('```', idx) if fence != -1 else -1
+            remaining = content[idx:remaining_end if remaining_end != -1 else None].strip()
             if remaining and len(remaining) > 10:
                 logger.warning(f"Extra text found after JSON ({len(remaining)} chars): {remaining[:100]}...")
             
@@ -167,4 +168,5 @@ class LeaseBedrockClient:
         # Close boto3 client if needed
         if hasattr(self.client, 'close'):
             self.client.close()
+        self.executor.shutdown(wait=False)
         logger.info("Lease Bedrock client closed")
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Body, Request
-from fastapi.responses import JSONResponse, StreamingResponse, HTMLResponse
+from fastapi.responses import StreamingResponse, HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional, Dict, List, Any
 from enum import Enum
@@ -115,9 +115,10 @@ app.add_middleware(
 @app.exception_handler(APIException)
 async def api_exception_handler(request, exc: APIException):
     """Handle custom API exceptions with structured error responses"""
-    return JSONResponse(
+    return Response(
+        content=exc.to_json(),
         status_code=exc.status_code,
-        content=exc.to_dict()
+        media_type="application/json"
     )
 
 # Initialize analyzer
@@ -204,6 +205,7 @@ async def root() -> Dict[str, str]:
             "vendor_work_order": "/maintenance/vendor",
             "maintenance_workflow": "/maintenance/workflow",
             "maintenance_chat": "/tenant/chat",
+            "maintenance_chat_stream": "/tenant/chat/stream",
             "tenant_rewrite": "/tenant/rewrite",
             "lease_generate": "/lease/generate",
             "extract_lease": "/extract-lease",
@@ -920,10 +922,10 @@ async def evaluate_move_out_request(
     logger.info(f"Evaluating move-out request: {validated_request[:100]}...")
     if validated_notes:
         logger.info(f"Owner notes: {validated_notes[:100]}...")
-    result = bedrock_client.evaluate_move_out_request(
-        move_out_request=validated_request,
-        lease_info=lease_info,
-        owner_notes=validated_notes
+    result = await bedrock_client.aevaluate_move_out_request(
+        validated_request,
+        lease_info,
+        validated_notes
     )
     
     return result
@@ -968,15 +970,63 @@ async def rewrite_tenant_message(
     logger.info(f"Rewriting tenant message: {validated_message[:100]}...")
     
     # Rewrite message using AI
-    result = bedrock_client.rewrite_tenant_message(
-        tenant_message=validated_message
-    )
+    result = await bedrock_client.arewrite_tenant_message(validated_message)
     
     logger.info(f"Message rewritten successfully. Urgency: {result.estimated_urgency}")
     
     return result
 
 
+def _check_chat_request(request: Request, chat_request: MaintenanceChatRequest) -> Optional[MaintenanceChatResponse]:
+    """
+    Rate-limit and validate a tenant chat request
+    
+    Returns:
+        A ready reply when the message is off-topic, otherwise None
+        
+    Raises:
+        RateLimitError: If the client exceeded the rate limit
+        ValidationError: If the conversation history is malformed
+    """
+    # Rate limiting
+    client_ip = request.client.host
+    if not check_rate_limit(client_ip):
+        raise RateLimitError(retry_after_seconds=RATE_LIMIT_WINDOW)
+    
+    # Validate conversation history format
+    for i, msg in enumerate(chat_request.conversationHistory):
+        if msg.role not in ["user", "assistant"]:
+            raise ValidationError(
+                message="Invalid conversation history format",
+                details=f"Message {i} has invalid role '{msg.role}'. Must be 'user' or 'assistant'",
+                suggestion="Check your conversationHistory format"
+            )
+    
+    # Validate last message is from user
+    if not chat_request.conversationHistory or chat_request.conversationHistory[-1].role != "user":
+        raise ValidationError(
+            message="Invalid conversation history format",
+            details="The last message in conversationHistory must be from the user",
+            suggestion="Append the new user message to the conversation history before sending"
+        )
+    
+    # Get the user's message from the last item in history
+    user_message = chat_request.conversationHistory[-1].content
+    logger.info(f"Maintenance chat from {client_ip}: '{user_message[:50]}...'")
+    logger.info(f"Conversation history: {len(chat_request.conversationHistory)} messages")
+    
+    # Validate topic (only for user messages, skip for very short responses like "yes"/"no")
+    if len(user_message.strip()) > 10:  # Only validate longer messages
+        is_valid, error_msg = validate_tenant_chat_topic(user_message)
+        if not is_valid:
+            return MaintenanceChatResponse(
+                response=error_msg,
+                suggestTicket=False
+            )
+    
+    return None
+
+
 @app.post("/tenant/chat", response_model=MaintenanceChatResponse)
 async def maintenance_chat(
     request: Request,
@@ -1079,47 +1129,13 @@ async def maintenance_chat(
         HTTPException: 400 if request format is invalid
         HTTPException: 500 if AI service fails
     """
-    # Rate limiting
-    client_ip = request.client.host
-    if not check_rate_limit(client_ip):
-        raise RateLimitError(retry_after_seconds=RATE_LIMIT_WINDOW)
-    
-    # Validate conversation history format
-    for i, msg in enumerate(chat_request.conversationHistory):
-        if msg.role not in ["user", "assistant"]:
-            raise ValidationError(
-                message="Invalid conversation history format",
-                details=f"Message {i} has invalid role '{msg.role}'. Must be 'user' or 'assistant'",
-                suggestion="Check your conversationHistory format"
-            )
-    
-    # Validate last message is from user
-    if not chat_request.conversationHistory or chat_request.conversationHistory[-1].role != "user":
-        raise ValidationError(
-            message="Invalid conversation history format",
-            details="The last message in conversationHistory must be from the user",
-            suggestion="Append the new user message to the conversation history before sending"
-        )
-    
-    # Get the user's message from the last item in history
-    user_message = chat_request.conversationHistory[-1].content
-    logger.info(f"Maintenance chat from {client_ip}: '{user_message[:50]}...'")
-    logger.info(f"Conversation history: {len(chat_request.conversationHistory)} messages")
-    
-    # Validate topic (only for user messages, skip for very short responses like "yes"/"no")
-    if len(user_message.strip()) > 10:  # Only validate longer messages
-        is_valid, error_msg = validate_tenant_chat_topic(user_message)
-        if not is_valid:
-            return MaintenanceChatResponse(
-                response=error_msg,
-                suggestTicket=False
-            )
+    off_topic_response = _check_chat_request(request, chat_request)
+    if off_topic_response is not None:
+        return off_topic_response
     
     try:
         # Process chat request
-        result = bedrock_client.maintenance_chat(
-            conversation_history=chat_request.conversationHistory
-        )
+        result = await bedrock_client.amaintenance_chat(chat_request.conversationHistory)
         
         logger.info(f"Chat response: suggestTicket={result.suggestTicket}")
         return result
@@ -1134,6 +1150,43 @@ async def maintenance_chat(
         )
 
 
+@app.post("/tenant/chat/stream")
+async def maintenance_chat_stream(
+    request: Request,
+    chat_request: MaintenanceChatRequest
+):
+    """
+    Tenant chatbot with a streamed reply (FREE)
+    
+    Same request body, validation and rate limit as `/tenant/chat`, but the reply is sent
+    as newline-delimited JSON while the model is still generating it, so the first words
+    reach the tenant in a few hundred milliseconds instead of after the full reply.
+    
+    **Response Format** (`application/x-ndjson`):
+    ```
+    {"delta": "Let's troubleshoot "}
+    {"delta": "this. Is the shower head removable?"}
+    {"response": "Let's troubleshoot this. Is the shower head removable?", "suggestTicket": false}
+    ```
+    
+    Append each `delta` to the message being shown; the last line is the complete
+    MaintenanceChatResponse (the only line for emergency replies). If the model fails,
+    the last line is the standard error payload instead
+    (`{"error": "AI_MODEL_ERROR", "message": ..., "details": ...}`); discard the deltas.
+    Off-topic messages are not streamed: they get the same `application/json`
+    MaintenanceChatResponse body as from `/tenant/chat`.
+    """
+    off_topic_response = _check_chat_request(request, chat_request)
+    if off_topic_response is not None:
+        return off_topic_response
+    
+    # Sync generator: Starlette iterates it in a worker thread, off the event loop
+    return StreamingResponse(
+        bedrock_client.maintenance_chat_stream(chat_request.conversationHistory),
+        media_type="application/x-ndjson"
+    )
+
+
 @app.post("/tenant/extract-request", response_model=MaintenanceRequestExtraction)
 async def extract_maintenance_request(
     chat_request: MaintenanceChatRequest
@@ -1173,9 +1226,7 @@ async def extract_maintenance_request(
         logger.info(f"Extracting maintenance request from {len(chat_request.conversationHistory)} messages")
         
         # Extract using Haiku
-        result = bedrock_client.extract_maintenance_request_from_chat(
-            conversation_history=chat_request.conversationHistory
-        )
+        result = await bedrock_client.aextract_maintenance_request_from_chat(chat_request.conversationHistory)
         
         logger.info(f"Extracted request - Title: {result.title}")
         return result
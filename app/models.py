@@ -72,6 +72,8 @@ class MaintenanceResponse(BaseModel):
 
 class VendorWorkOrder(BaseModel):
     """AI-generated work order for vendor to fix maintenance issue"""
+    model_config = ConfigDict(frozen=True)
+    
     maintenance_request: str  # Original request from tenant
     work_order_title: str  # Brief title for work order
     comprehensive_description: str  # Complete description with issue, property details, access, urgency, scope, requirements
@@ -80,6 +82,8 @@ class VendorWorkOrder(BaseModel):
 
 class MoveOutResponse(BaseModel):
     """Landlord's response to tenant move-out request evaluated against lease"""
+    model_config = ConfigDict(frozen=True)
+    
     move_out_request: str  # Original move-out request from tenant
     decision: str = Field(..., description="'approved' or 'requires_attention'")
     response_message: str  # Professional response message for tenant
@@ -259,6 +263,8 @@ class AnalyzeRequest(BaseModel):
 
 class TenantMessageRewrite(BaseModel):
     """Tenant's rewritten maintenance message for landlord"""
+    model_config = ConfigDict(frozen=True)
+    
     original_message: str  # What tenant typed initially
     rewritten_message: str  # AI-improved professional message
     improvements_made: List[str]  # List of improvements (clarity, professionalism, etc.)
@@ -268,6 +274,8 @@ class TenantMessageRewrite(BaseModel):
 
 class MaintenanceWorkflow(BaseModel):
     """Complete maintenance workflow: tenant message, landlord evaluation, and vendor work order"""
+    model_config = ConfigDict(frozen=True)
+    
     maintenance_request: str  # Original request from tenant
     
     # Tenant communication
@@ -322,13 +330,15 @@ class MaintenanceChatResponse(BaseModel):
         description="True if issue needs professional attention and should create ticket"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "response": "Let's troubleshoot this. Is the shower head removable, or is it fixed to the pipe?",
                 "suggestTicket": False
             }
         }
+    )
 
 
 class MaintenanceRequestExtraction(BaseModel):
@@ -336,13 +346,15 @@ class MaintenanceRequestExtraction(BaseModel):
     title: str = Field(..., description="Brief title for the maintenance request (max 80 chars, from tenant's perspective)", max_length=80)
     description: str = Field(..., description="Detailed description of the issue from tenant's conversation")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "title": "Broken shower head leaking water",
                 "description": "The shower head in the main bathroom is broken and leaking water constantly. It's been dripping for 2 days and getting worse. The water pressure is also very low when trying to use it."
             }
         }
+    )
 
 
 # ============================================================================
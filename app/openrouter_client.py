@@ -565,10 +565,10 @@ Return your analysis in the following JSON format:
             json_str = response_text
             if "```json" in response_text:
                 logger.info("Found ```json marker, extracting...")
-                json_str = response_text.split("```json")[1].split("```")[0]
+                json_str = response_text.partition("```json")[2].partition("```")[0]
             elif "```" in response_text:
                 logger.info("Found ``` marker, extracting...")
-                json_str = response_text.split("```")[1].split("```")[0]
+                json_str = response_text.partition("```")[2].partition("```")[0]
             else:
                 logger.info("No code blocks found, using full response")
             
@@ -725,8 +725,7 @@ Return your analysis in the following JSON format:
                 total_time_seconds=elapsed_time,
                 cost_usd=self._calculate_cost(model_name, tokens_used),
                 gov_citations_count=sum(
-                    len([c for c in v.citations if c.is_gov_site]) 
-                    for v in all_violations
+                    1 for v in all_violations for c in v.citations if c.is_gov_site
                 ),
                 total_citations_count=sum(len(v.citations) for v in all_violations),
                 violations_found=len(all_violations),
@@ -1099,17 +1098,17 @@ Examples:
             # Method 1: Look for ```json code blocks
             if "```json" in response_text:
                 logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
+                _, sep, rest = response_text.partition("```json")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ```json block")
             
             # Method 2: Look for plain ``` code blocks
             elif "```" in response_text and json_str is None:
                 logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
+                _, sep, rest = response_text.partition("```")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ``` block")
             
             # Method 3: Find { to } brackets
@@ -1341,17 +1340,17 @@ Rules:
             # Method 1: Look for ```json code blocks
             if "```json" in response_text:
                 logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
+                _, sep, rest = response_text.partition("```json")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ```json block")
             
             # Method 2: Look for plain ``` code blocks
             elif "```" in response_text and json_str is None:
                 logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
+                _, sep, rest = response_text.partition("```")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ``` block")
             
             # Method 3: Find { to } brackets
@@ -1612,17 +1611,17 @@ NOW PROCESS THE MAINTENANCE REQUEST ABOVE AND RETURN ONLY THE JSON:
             # Method 1: Look for ```json code blocks
             if "```json" in response_text:
                 logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
+                _, sep, rest = response_text.partition("```json")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ```json block")
             
             # Method 2: Look for plain ``` code blocks
             elif "```" in response_text and json_str is None:
                 logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
+                _, sep, rest = response_text.partition("```")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ``` block")
             
             # Method 3: Find { to } brackets
@@ -1854,17 +1853,17 @@ Rules:
             # Method 1: Look for ```json code blocks
             if "```json" in response_text:
                 logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
+                _, sep, rest = response_text.partition("```json")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ```json block")
             
             # Method 2: Look for plain ``` code blocks
             elif "```" in response_text and json_str is None:
                 logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
+                _, sep, rest = response_text.partition("```")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ``` block")
             
             # Method 3: Find { to } brackets
@@ -2192,17 +2191,17 @@ CRITICAL REMINDERS:
             # Method 1: Look for ```json code blocks
             if "```json" in response_text:
                 logger.info("Found ```json marker, extracting...")
-                parts = response_text.split("```json")
-                if len(parts) > 1:
-                    json_str = parts[1].split("```")[0].strip()
+                _, sep, rest = response_text.partition("```json")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ```json block")
             
             # Method 2: Look for plain ``` code blocks
             elif "```" in response_text and json_str is None:
                 logger.info("Found ``` marker, extracting...")
-                parts = response_text.split("```")
-                if len(parts) > 1:
-                    json_str = parts[1].strip()
+                _, sep, rest = response_text.partition("```")
+                if sep:
+                    json_str = rest.partition("```")[0].strip()
                     logger.info("Extracted from ``` block")
             
             # Method 3: Find { to } brackets
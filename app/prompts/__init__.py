@@ -6,48 +6,48 @@ This package contains organized prompt builders for different domains:
 - maintenance_prompts: Maintenance request handling
 - tenant_communication_prompts: Tenant messaging and move-out evaluations
 - chat_prompts: Conversational maintenance assistant
+
+Submodules are imported lazily on first attribute access (PEP 562), so importing
+one prompt module does not load the others.
 """
 
-from app.prompts.lease_analysis_prompts import (
-    build_lease_analysis_prompt,
-    build_categorized_analysis_prompt,
-    CATEGORIZED_ANALYSIS_SYSTEM_PROMPT
-)
-
-from app.prompts.maintenance_prompts import (
-    build_maintenance_evaluation_prompt,
-    build_vendor_work_order_prompt,
-    build_maintenance_workflow_prompt
-)
-
-from app.prompts.tenant_communication_prompts import (
-    build_tenant_message_rewrite_prompt,
-    build_move_out_evaluation_prompt
-)
-
-from app.prompts.chat_prompts import (
-    MAINTENANCE_CHAT_SYSTEM_PROMPT,
-    build_maintenance_extraction_prompt,
-    build_conversation_summary_prompt
-)
-
-__all__ = [
+import importlib
+
+_LAZY_EXPORTS = {
     # Lease analysis
-    "build_lease_analysis_prompt",
-    "build_categorized_analysis_prompt",
-    "CATEGORIZED_ANALYSIS_SYSTEM_PROMPT",
+    "build_lease_analysis_prompt": "lease_analysis_prompts",
+    "build_categorized_analysis_prompt": "lease_analysis_prompts",
+    "CATEGORIZED_ANALYSIS_SYSTEM_PROMPT": "lease_analysis_prompts",
     
     # Maintenance
-    "build_maintenance_evaluation_prompt",
-    "build_vendor_work_order_prompt",
-    "build_maintenance_workflow_prompt",
+    "build_maintenance_evaluation_prompt": "maintenance_prompts",
+    "build_vendor_work_order_prompt": "maintenance_prompts",
+    "build_maintenance_workflow_prompt": "maintenance_prompts",
+    "MAINTENANCE_EVALUATION_SYSTEM_PROMPT": "maintenance_prompts",
+    "VENDOR_WORK_ORDER_SYSTEM_PROMPT": "maintenance_prompts",
+    "MAINTENANCE_WORKFLOW_SYSTEM_PROMPT": "maintenance_prompts",
     
     # Tenant communication
-    "build_tenant_message_rewrite_prompt",
-    "build_move_out_evaluation_prompt",
+    "build_tenant_message_rewrite_prompt": "tenant_communication_prompts",
+    "build_move_out_evaluation_prompt": "tenant_communication_prompts",
     
     # Chat
-    "MAINTENANCE_CHAT_SYSTEM_PROMPT",
-    "build_maintenance_extraction_prompt",
-    "build_conversation_summary_prompt",
-]
+    "MAINTENANCE_CHAT_SYSTEM_PROMPT": "chat_prompts",
+    "build_maintenance_extraction_prompt": "chat_prompts",
+    "build_conversation_summary_prompt": "chat_prompts",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
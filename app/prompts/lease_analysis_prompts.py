@@ -4,6 +4,32 @@ from typing import Optional, List, Dict
 from app.models import LeaseInfo
 
 
+_SEARCH_RESULT_FIELDS = ("title", "snippet", "url")
+_CELL_ESCAPES = str.maketrans({"|": "/", "\n": " ", "\r": " "})
+
+
+def _format_search_results_table(search_results: List[Dict[str, str]]) -> str:
+    """
+    Render search results as a pipe-delimited table with a single header row.
+    
+    Field names are emitted once instead of being repeated for every result,
+    which keeps the prompt (and its input-token cost) smaller.
+    
+    Args:
+        search_results: Search results with title, snippet and url keys
+        
+    Returns:
+        Table text ending with a newline
+    """
+    lines = ["|".join(_SEARCH_RESULT_FIELDS)]
+    for result in search_results:
+        lines.append("|".join(
+            str(result.get(field, "")).translate(_CELL_ESCAPES)
+            for field in _SEARCH_RESULT_FIELDS
+        ))
+    return "\n".join(lines) + "\n"
+
+
 def build_lease_analysis_prompt(
     lease_info: LeaseInfo,
     search_results: Optional[List[Dict[str, str]]],
@@ -87,10 +113,8 @@ Return your analysis in the following JSON format:
         # DuckDuckGo search results provided
         prompt += "\nRELEVANT LAW SEARCH RESULTS (from DuckDuckGo):\n"
         if search_results:
-            for i, result in enumerate(search_results[:10], 1):
-                prompt += f"\n{i}. {result['title']}\n"
-                prompt += f"   URL: {result['url']}\n"
-                prompt += f"   {result['snippet']}\n"
+            prompt += "One result per row, columns separated by '|':\n"
+            prompt += _format_search_results_table(search_results[:10])
         else:
             prompt += "No search results provided.\n"
         
@@ -1,10 +1,12 @@
 """Prompt templates for tenant communication operations"""
 
+from functools import lru_cache
 from typing import Optional
 from app.models import LeaseInfo
 from datetime import datetime
 
 
+@lru_cache(maxsize=512)
 def build_tenant_message_rewrite_prompt(tenant_message: str) -> str:
     """
     Build prompt for rewriting tenant messages professionally.
@@ -81,8 +83,24 @@ def build_move_out_evaluation_prompt(
     Returns:
         Formatted prompt string
     """
-    today = datetime.now().strftime("%B %d, %Y")
-    
+    # The prompt only reads the first 6000 characters of the lease, so cache on that
+    # (plus today's date, which the notice calculations depend on)
+    return _move_out_evaluation_prompt(
+        move_out_request,
+        lease_info.full_text[:6000],
+        owner_notes,
+        datetime.now().strftime("%B %d, %Y")
+    )
+
+
+@lru_cache(maxsize=256)
+def _move_out_evaluation_prompt(
+    move_out_request: str,
+    lease_text: str,
+    owner_notes: Optional[str],
+    today: str
+) -> str:
+    """Move-out evaluation prompt for hashable inputs (see build_move_out_evaluation_prompt)"""
     prompt = f"""You are a property owner evaluating a tenant's move-out request. Review the lease agreement and determine:
 1. If the tenant provided proper notice according to the lease
 2. What financial obligations remain (rent, fees, security deposit)
@@ -105,7 +123,7 @@ NOTE: Consider the owner's notes when crafting the response, but the evaluation
     
     prompt += f"""
 LEASE DOCUMENT:
-{lease_info.full_text[:6000]}
+{lease_text}
 
 INSTRUCTIONS:
 1. Carefully review the lease to find:
@@ -0,0 +1,180 @@
+"""Tests for BedrockClient's Bedrock error translation and model fallback"""
+import io
+
+import orjson
+import pytest
+from botocore.exceptions import ClientError, EventStreamError
+
+from app import bedrock_client
+from app.bedrock_client import BedrockClient
+from app.exceptions import AITimeoutError, AIThrottlingError
+
+
+class _BrokenStream:
+    """Response-stream body whose error event arrives after the first text delta"""
+
+    def __init__(self, error_code):
+        self.error_code = error_code
+
+    def __iter__(self):
+        yield {"chunk": {"bytes": b'{"type": "content_block_delta", "delta": {"text": "{\\"a\\""}}'}}
+        raise EventStreamError(
+            {"Error": {"Code": self.error_code, "Message": "stream failed"}},
+            "InvokeModelWithResponseStream"
+        )
+
+
+class _StreamErrorClient:
+    def __init__(self, error_code):
+        self.error_code = error_code
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        return {"body": _BrokenStream(self.error_code)}
+
+    def invoke_model(self, modelId, body, **kwargs):
+        raise ClientError({"Error": {"Code": self.error_code, "Message": "request failed"}}, "InvokeModel")
+
+
+def _client(fake):
+    client = BedrockClient.__new__(BedrockClient)  # no AWS session needed
+    client.client = fake
+    return client
+
+
+class TestBedrockErrorCodes:
+    """Stream error events use lower camel case but must map like InvokeModel errors"""
+
+    @pytest.mark.parametrize("error_code, expected", [
+        ("throttlingException", AIThrottlingError),
+        ("modelTimeoutException", AITimeoutError),
+        ("modelStreamErrorException", AITimeoutError),
+    ])
+    def test_mid_stream_errors(self, error_code, expected):
+        client = _client(_StreamErrorClient(error_code))
+
+        with pytest.raises(expected):
+            client._invoke_bedrock("us.anthropic.claude-3-5-haiku-20241022-v1:0", {}, stream=True)
+
+    @pytest.mark.parametrize("error_code, expected", [
+        ("ThrottlingException", AIThrottlingError),
+        ("ModelTimeoutException", AITimeoutError),
+    ])
+    def test_invoke_model_errors(self, error_code, expected):
+        client = _client(_StreamErrorClient(error_code))
+
+        with pytest.raises(expected):
+            client._invoke_bedrock("us.anthropic.claude-3-5-haiku-20241022-v1:0", {})
+
+
+_PRIMARY = "us.anthropic.claude-3-5-haiku-20241022-v1:0"
+_SECONDARY = "us.meta.llama3-1-70b-instruct-v1:0"
+_CHAIN = [_PRIMARY, _SECONDARY]
+
+
+class _ChainClient:
+    """Fake bedrock-runtime client failing the models listed in failures with their error code"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = []
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self.calls.append(modelId)
+        error_code = self.failures.get(modelId)
+        if error_code:
+            raise ClientError({"Error": {"Code": error_code, "Message": "failed"}}, "InvokeModel")
+        if "anthropic" in modelId:
+            reply = {"content": [{"type": "text", "text": '{"ok": true}'}], "usage": {"input_tokens": 10, "output_tokens": 5}}
+        else:
+            reply = {"generation": '{"ok": true}', "prompt_token_count": 10, "generation_token_count": 5}
+        return {"body": io.BytesIO(orjson.dumps(reply))}
+
+
+@pytest.fixture
+def model_state(monkeypatch):
+    """Fresh class-level circuit breaker and denylist, and a controllable clock"""
+    monkeypatch.setattr(BedrockClient, "_circuit", {})
+    monkeypatch.setattr(BedrockClient, "_denied_models", set())
+    clock = [1000.0]
+    monkeypatch.setattr(bedrock_client.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+def _fallback(fake):
+    return _client(fake)._call_with_fallback(lambda model_id: {}, _CHAIN)
+
+
+class TestCallWithFallback:
+    """Per-model circuit breaker and access-denied list behind _call_with_fallback"""
+
+    def test_circuit_opens_after_threshold_failures(self, model_state):
+        fake = _ChainClient({_PRIMARY: "ThrottlingException"})
+
+        for _ in range(BedrockClient.CIRCUIT_FAILURE_THRESHOLD):
+            assert _fallback(fake)[0] == '{"ok": true}'
+        fake.calls.clear()
+        _fallback(fake)
+
+        assert fake.calls == [_SECONDARY]
+
+    def test_circuit_stays_closed_below_threshold(self, model_state):
+        fake = _ChainClient({_PRIMARY: "ThrottlingException"})
+
+        for _ in range(BedrockClient.CIRCUIT_FAILURE_THRESHOLD - 1):
+            _fallback(fake)
+        fake.calls.clear()
+        _fallback(fake)
+
+        assert fake.calls == [_PRIMARY, _SECONDARY]
+
+    def test_open_model_is_retried_after_cooldown(self, model_state):
+        fake = _ChainClient({_PRIMARY: "ThrottlingException"})
+        for _ in range(BedrockClient.CIRCUIT_FAILURE_THRESHOLD):
+            _fallback(fake)
+
+        model_state[0] += BedrockClient.CIRCUIT_COOLDOWN_SECONDS - 1
+        fake.calls.clear()
+        _fallback(fake)
+        assert fake.calls == [_SECONDARY]
+
+        model_state[0] += 1
+        fake.failures.clear()
+        fake.calls.clear()
+        _fallback(fake)
+        assert fake.calls == [_PRIMARY]
+        assert _PRIMARY not in BedrockClient._circuit
+
+    def test_full_chain_tried_when_every_model_is_skipped(self, model_state):
+        fake = _ChainClient({_PRIMARY: "ThrottlingException", _SECONDARY: "ThrottlingException"})
+        for _ in range(BedrockClient.CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(AIThrottlingError):
+                _fallback(fake)
+
+        fake.failures.clear()
+        fake.calls.clear()
+        _fallback(fake)
+
+        assert fake.calls == [_PRIMARY]
+
+    def test_denied_model_stays_skipped(self, model_state):
+        fake = _ChainClient({_PRIMARY: "AccessDeniedException"})
+
+        _fallback(fake)
+        fake.failures.clear()
+        model_state[0] += 3600
+        fake.calls.clear()
+        _fallback(fake)
+
+        assert fake.calls == [_SECONDARY]
+        assert _PRIMARY in BedrockClient._denied_models
+
+    def test_clear_denylist_restores_model(self, model_state):
+        fake = _ChainClient({_PRIMARY: "AccessDeniedException"})
+        _fallback(fake)
+
+        BedrockClient.clear_denylist()
+        fake.failures.clear()
+        fake.calls.clear()
+        _fallback(fake)
+
+        assert fake.calls == [_PRIMARY]
@@ -0,0 +1,119 @@
+"""Tests for the shared Bedrock client helpers"""
+import json
+
+import pytest
+
+from app.bedrock_utils import fix_truncated_json, read_response_stream, scan_json_block
+
+
+class FakeEventStream:
+    """Stands in for botocore's EventStream: iterable of {'chunk': {'bytes': ...}} events"""
+
+    def __init__(self, chunks):
+        self.events = [{"chunk": {"bytes": json.dumps(chunk).encode()}} for chunk in chunks]
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for event in self.events:
+            self.consumed += 1
+            yield event
+
+    def close(self):
+        self.closed = True
+
+
+def _anthropic_stream(text_deltas, metrics):
+    chunks = [{"type": "message_start", "message": {"usage": {"input_tokens": metrics["inputTokenCount"]}}}]
+    chunks += [{"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}} for text in text_deltas]
+    chunks += [
+        {"type": "content_block_stop"},
+        {"type": "message_delta", "usage": {"output_tokens": metrics["outputTokenCount"]}},
+        {"type": "message_stop", "amazon-bedrock-invocationMetrics": metrics},
+    ]
+    return FakeEventStream(chunks)
+
+
+class TestReadResponseStream:
+    """read_response_stream keeps the JSON answer and still reports token usage"""
+
+    def test_token_usage_read_from_final_chunk_after_json_closes(self):
+        stream = _anthropic_stream(
+            ['{"violations": [', '{"id": "}"}', ']}'],
+            {"inputTokenCount": 1200, "outputTokenCount": 340}
+        )
+
+        text, tokens = read_response_stream(stream, "anthropic")
+
+        assert text == '{"violations": [{"id": "}"}]}'
+        assert tokens == {"prompt": 1200, "completion": 340, "total": 1540}
+        assert stream.consumed == len(stream.events)
+        assert stream.closed
+
+    def test_text_after_json_is_dropped(self):
+        stream = FakeEventStream([
+            {"generation": '{"a": 1}'},
+            {"generation": " Let me know if you need more."},
+            {"generation": "", "amazon-bedrock-invocationMetrics": {"inputTokenCount": 50, "outputTokenCount": 20}},
+        ])
+
+        text, tokens = read_response_stream(stream, "meta")
+
+        assert text == '{"a": 1}'
+        assert tokens["total"] == 70
+
+    def test_prompt_cache_tokens_counted(self):
+        stream = _anthropic_stream(
+            ['{"ok": true}'],
+            {
+                "inputTokenCount": 10,
+                "outputTokenCount": 5,
+                "cacheReadInputTokenCount": 900,
+                "cacheWriteInputTokenCount": 0,
+            }
+        )
+
+        _, tokens = read_response_stream(stream, "anthropic")
+
+        assert tokens == {"prompt": 910, "completion": 5, "total": 915, "cache_read": 900, "cache_write": 0}
+
+
+class TestFixTruncatedJson:
+    """fix_truncated_json closes what is open and ignores brackets inside strings"""
+
+    def test_complete_json_is_unchanged(self):
+        text = '{"a": [1, 2], "b": "x]}"}'
+
+        assert fix_truncated_json(text) == text
+
+    @pytest.mark.parametrize("truncated, expected", [
+        ('{"a": [{"b', {"a": [{}]}),
+        ('{"a": "x]", "b', {"a": "x]"}),
+        ('{"a": 1, "b"', {"a": 1}),
+        ('{"a": 1, "b" ', {"a": 1}),
+        ('{"a": 1, "b":', {"a": 1, "b": None}),
+        ('{"a": "half a val', {"a": "half a val"}),
+        ('{"a": "ends in \\', {"a": "ends in "}),
+        ('{"a": [1, 2,', {"a": [1, 2]}),
+        ('{"a": {"b": "}"}, "c": [', {"a": {"b": "}"}, "c": []}),
+    ])
+    def test_truncated_json_is_repaired(self, truncated, expected):
+        assert json.loads(fix_truncated_json(truncated)) == expected
+
+
+class TestScanJsonBlock:
+    """scan_json_block finds the closing brace of the object opening at start"""
+
+    def test_nested_object(self):
+        text = 'Result: {"a": {"b": 1}} trailing'
+        start = text.index("{")
+
+        assert text[start:scan_json_block(text, start)] == '{"a": {"b": 1}}'
+
+    def test_braces_and_escaped_quotes_inside_strings(self):
+        text = '{"a": "}{", "b": "say \\"}\\""} after'
+
+        assert text[:scan_json_block(text, 0)] == '{"a": "}{", "b": "say \\"}\\""}'
+
+    def test_unclosed_object_returns_none(self):
+        assert scan_json_block('{"a": {"b": 1}', 0) is None
@@ -0,0 +1,176 @@
+"""Tests for parsing and streaming the maintenance chat model's reply"""
+import io
+
+import orjson
+import pytest
+from botocore.exceptions import ClientError
+
+from app.bedrock_client import BedrockClient
+from app.config import settings
+from app.exceptions import AIModelError
+from app.models import ChatMessage
+
+
+class _ReplyClient:
+    """Fake bedrock-runtime client answering every InvokeModel call with one Claude reply"""
+
+    def __init__(self, reply_text):
+        self.reply_text = reply_text
+
+    def invoke_model(self, modelId, body, **kwargs):
+        return {"body": io.BytesIO(orjson.dumps({
+            "content": [{"type": "text", "text": self.reply_text}],
+            "usage": {"input_tokens": 10, "output_tokens": 12},
+        }))}
+
+
+def _chat(reply_text):
+    client = BedrockClient.__new__(BedrockClient)
+    client.client = _ReplyClient(reply_text)
+    return client.maintenance_chat([ChatMessage(role="user", content="My kitchen sink drains slowly")])
+
+
+class TestParseChatResponse:
+    """Control-character repair must keep JSON whitespace between tokens intact"""
+
+    def test_pretty_printed_reply_with_control_character(self):
+        result = _chat('{\n  "response": "Check the shutoff valve.\x00",\n  "suggestTicket": false\n}')
+
+        assert result.response == "Check the shutoff valve."
+        assert result.suggestTicket is False
+
+    def test_raw_newlines_inside_string_value(self):
+        result = _chat('{\n  "response": "Step one\nStep two\twait",\n  "suggestTicket": true\n}')
+
+        assert result.response == "Step one\nStep two\twait"
+        assert result.suggestTicket is True
+
+
+class TestUnexpectedReplyShapes:
+    """Valid JSON that is not a {"response": str} object falls back to the raw reply text"""
+
+    @pytest.mark.parametrize("reply_text", ['["a"]', '"text"', '{"response": null}', '{"response": ["a"]}'])
+    def test_raw_text_returned(self, reply_text):
+        result = _chat(reply_text)
+
+        assert result.response == reply_text
+        assert result.suggestTicket is False
+
+
+class _ReplyStream:
+    """Response-stream body delivering a Claude reply as text deltas"""
+
+    def __init__(self, reply_text):
+        self.events = [
+            {"chunk": {"bytes": orjson.dumps({"type": "content_block_delta", "delta": {"text": reply_text}})}},
+            {"chunk": {"bytes": orjson.dumps({"type": "message_stop"})}},
+        ]
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def close(self):
+        pass
+
+
+class _StreamReplyClient:
+    def __init__(self, reply_text):
+        self.reply_text = reply_text
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        return {"body": _ReplyStream(self.reply_text)}
+
+
+def _stream_lines(reply_text):
+    client = BedrockClient.__new__(BedrockClient)
+    client.client = _StreamReplyClient(reply_text)
+    history = [ChatMessage(role="user", content="My kitchen sink drains slowly")]
+    return [orjson.loads(line) for line in client.maintenance_chat_stream(history)]
+
+
+class TestMaintenanceChatStreamReplies:
+    """Every stream ends with one final line, whatever JSON the model sent"""
+
+    def test_reply_streams_deltas_then_final_response(self):
+        lines = _stream_lines('{"response": "Is the stopper closed?", "suggestTicket": false}')
+
+        assert lines[0] == {"delta": "Is the stopper closed?"}
+        assert lines[-1] == {"response": "Is the stopper closed?", "suggestTicket": False}
+
+    @pytest.mark.parametrize("reply_text", ['["a"]', '"text"', '{"response": null}'])
+    def test_unexpected_shape_ends_with_raw_text(self, reply_text):
+        lines = _stream_lines(reply_text)
+
+        assert lines[-1] == {"response": reply_text, "suggestTicket": False}
+
+    def test_parse_failure_ends_with_error_line(self, monkeypatch):
+        def failing_parse(self, response_text):
+            raise RuntimeError("unparseable")
+
+        monkeypatch.setattr(BedrockClient, "_parse_chat_response", failing_parse)
+
+        lines = _stream_lines('{"response": "Is the stopper closed?", "suggestTicket": false}')
+
+        assert lines[0] == {"delta": "Is the stopper closed?"}
+        assert lines[-1]["error"] == "AI_MODEL_ERROR"
+        assert lines[-1]["details"] == "unparseable"
+
+
+class _FailingStreamClient:
+    def invoke_model_with_response_stream(self, **kwargs):
+        raise RuntimeError("ThrottlingException")
+
+
+class TestMaintenanceChatStreamErrors:
+    """Failures after the response has started must end the NDJSON body with an error line"""
+
+    def test_fallback_failure_yields_error_line(self, monkeypatch):
+        client = BedrockClient.__new__(BedrockClient)
+        client.client = _FailingStreamClient()
+
+        def failing_chat(conversation_history):
+            raise AIModelError(message="Failed to process chat message", details="all models failed")
+
+        monkeypatch.setattr(client, "maintenance_chat", failing_chat)
+        history = [ChatMessage(role="user", content="My kitchen sink drains slowly")]
+
+        lines = list(client.maintenance_chat_stream(history))
+
+        assert len(lines) == 1
+        payload = orjson.loads(lines[0])
+        assert payload["error"] == "AI_MODEL_ERROR"
+        assert payload["details"] == "all models failed"
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.bodies = {}
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self.bodies[modelId] = orjson.loads(body)
+        if "anthropic" in modelId:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "InvokeModel")
+        return {"body": io.BytesIO(orjson.dumps({
+            "generation": '{"response": "Is the drain stopper closed?", "suggestTicket": false}',
+            "prompt_token_count": 10,
+            "generation_token_count": 12,
+        }))}
+
+
+class TestMaintenanceChatFallback:
+    """Non-Claude fallbacks must get the chat's token budget, not the lease-analysis one"""
+
+    def test_llama_fallback_uses_chat_parameters(self, monkeypatch):
+        monkeypatch.setattr(settings, "FALLBACK_MODELS", ["us.meta.llama3-1-70b-instruct-v1:0"])
+        monkeypatch.setattr(BedrockClient, "_circuit", {})
+        client = BedrockClient.__new__(BedrockClient)
+        client.client = _RecordingClient()
+        history = [ChatMessage(role="user", content="My kitchen sink drains slowly")]
+
+        result = client.maintenance_chat(history)
+
+        llama_body = client.client.bodies["us.meta.llama3-1-70b-instruct-v1:0"]
+        claude_body = client.client.bodies[settings.FREE_MODEL]
+        assert result.response == "Is the drain stopper closed?"
+        assert llama_body["max_gen_len"] == claude_body["max_tokens"]
+        assert llama_body["temperature"] == claude_body["temperature"]